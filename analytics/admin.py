@@ -0,0 +1,7 @@
+from django.contrib import admin
+
+from analytics.models import DailyAuthorSummary, DailyBookSummary, DailySummary
+
+admin.site.register(DailySummary)
+admin.site.register(DailyBookSummary)
+admin.site.register(DailyAuthorSummary)
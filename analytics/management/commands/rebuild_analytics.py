@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from analytics import summary
+
+
+class Command(BaseCommand):
+    help = "Recompute the circulation and revenue summaries from borrowing history"
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows = summary.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {rows} book summaries "
+                f"in {time.perf_counter() - started:.1f} s"
+            )
+        )
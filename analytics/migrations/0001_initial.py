@@ -0,0 +1,116 @@
+# Generated by Django 4.2.4 on 2026-10-18 17:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("books", "0006_author_author_last_name_lower_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailySummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("borrows", models.PositiveIntegerField(default=0)),
+                ("returns", models.PositiveIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("day", models.DateField(unique=True)),
+            ],
+            options={
+                "verbose_name_plural": "daily summaries",
+                "ordering": ["day"],
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyBookSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("borrows", models.PositiveIntegerField(default=0)),
+                ("returns", models.PositiveIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("day", models.DateField()),
+                (
+                    "book",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_summaries",
+                        to="books.book",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "daily book summaries",
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyAuthorSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("borrows", models.PositiveIntegerField(default=0)),
+                ("returns", models.PositiveIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("day", models.DateField()),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_summaries",
+                        to="books.author",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "daily author summaries",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailybooksummary",
+            constraint=models.UniqueConstraint(
+                fields=("day", "book"), name="daily_book_summary_unique"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="dailyauthorsummary",
+            constraint=models.UniqueConstraint(
+                fields=("day", "author"), name="daily_author_summary_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.db import models
+
+from books.models import Author, Book
+
+
+class SummaryCounts(models.Model):
+    borrows = models.PositiveIntegerField(default=0)
+    returns = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        abstract = True
+
+
+class DailySummary(SummaryCounts):
+    day = models.DateField(unique=True)
+
+    class Meta:
+        ordering = ["day"]
+        verbose_name_plural = "daily summaries"
+
+    def __str__(self):
+        return f"{self.day}"
+
+
+class DailyBookSummary(SummaryCounts):
+    day = models.DateField()
+    book = models.ForeignKey(
+        Book, on_delete=models.CASCADE, related_name="daily_summaries"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "book"], name="daily_book_summary_unique"
+            )
+        ]
+        verbose_name_plural = "daily book summaries"
+
+    def __str__(self):
+        return f"{self.day} {self.book_id}"
+
+
+class DailyAuthorSummary(SummaryCounts):
+    day = models.DateField()
+    author = models.ForeignKey(
+        Author, on_delete=models.CASCADE, related_name="daily_summaries"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "author"], name="daily_author_summary_unique"
+            )
+        ]
+        verbose_name_plural = "daily author summaries"
+
+    def __str__(self):
+        return f"{self.day} {self.author_id}"
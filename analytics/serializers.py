@@ -0,0 +1,34 @@
+from rest_framework import serializers
+
+from analytics.models import DailySummary
+
+
+class DailySummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailySummary
+        fields = ["day", "borrows", "returns", "revenue"]
+
+
+class BookSummarySerializer(serializers.Serializer):
+    """Rows of DailyBookSummary totals per book"""
+
+    book = serializers.IntegerField(source="book_id")
+    title = serializers.CharField(source="book__title")
+    borrows = serializers.IntegerField(source="total_borrows")
+    returns = serializers.IntegerField(source="total_returns")
+    revenue = serializers.DecimalField(
+        source="total_revenue", max_digits=14, decimal_places=2
+    )
+
+
+class AuthorSummarySerializer(serializers.Serializer):
+    """Rows of DailyAuthorSummary totals per author"""
+
+    author = serializers.IntegerField(source="author_id")
+    first_name = serializers.CharField(source="author__first_name")
+    last_name = serializers.CharField(source="author__last_name")
+    borrows = serializers.IntegerField(source="total_borrows")
+    returns = serializers.IntegerField(source="total_returns")
+    revenue = serializers.DecimalField(
+        source="total_revenue", max_digits=14, decimal_places=2
+    )
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from analytics import summary
+from borrowings.models import Borrowing
+from borrowings.signals import books_borrowed, books_returned
+
+
+@receiver(books_borrowed)
+def update_summaries_when_books_borrowed(sender, borrowings, **kwargs):
+    summary.record_borrowings(borrowings)
+
+
+@receiver(books_returned)
+def update_summaries_when_books_returned(sender, borrowings, **kwargs):
+    summary.record_returns(borrowings, kwargs.get("daily_fees"))
+
+
+@receiver(post_save, sender=Borrowing)
+def update_summaries_when_borrowing_saved(sender, instance, created, **kwargs):
+    """Borrowings saved through the ORM rather than borrowings.operations"""
+    if created and not getattr(instance, "_inventory_reserved", False):
+        summary.record_borrowings([instance])
+        if instance.actual_return_date:
+            summary.record_returns([instance])
+    elif getattr(instance, "_returned", False):
+        summary.record_returns([instance])
@@ -0,0 +1,158 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import connections, router, transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+
+from analytics.models import DailyAuthorSummary, DailyBookSummary, DailySummary
+from books.models import Book
+from borrowings.managers import DaysBetween
+from borrowings.models import Borrowing
+
+COUNT_FIELDS = ["borrows", "returns", "revenue"]
+
+
+def new_counts():
+    return [0, 0, Decimal(0)]
+
+
+def add_counts(model, key_fields, counts):
+    """
+    Add {key: [borrows, returns, revenue]} to a summary table, creating
+    missing rows, with INSERT ... ON CONFLICT DO UPDATE statements.
+    """
+    if not counts:
+        return
+
+    connection = connections[router.db_for_write(model)]
+    if connection.vendor not in ("postgresql", "sqlite"):
+        for key, values in counts.items():
+            lookup = dict(zip(key_fields, key))
+            updated = model.objects.filter(**lookup).update(
+                **{name: F(name) + value for name, value in zip(COUNT_FIELDS, values)}
+            )
+            if not updated:
+                model.objects.create(**lookup, **dict(zip(COUNT_FIELDS, values)))
+        return
+
+    quote_name = connection.ops.quote_name
+    table = quote_name(model._meta.db_table)
+    fields = [model._meta.get_field(name) for name in key_fields + COUNT_FIELDS]
+    columns = [quote_name(field.column) for field in fields]
+    key_columns = columns[: len(key_fields)]
+    count_columns = columns[len(key_fields) :]
+    row_placeholder = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    updates = ", ".join(
+        f"{column} = {table}.{column} + excluded.{column}" for column in count_columns
+    )
+
+    rows = [
+        [
+            field.get_db_prep_save(value, connection)
+            for field, value in zip(fields, (*key, *values))
+        ]
+        for key, values in counts.items()
+    ]
+    batch_size = (connection.features.max_query_params or 999) // len(columns)
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES {', '.join([row_placeholder] * len(batch))} "
+                f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates}",
+                [value for row in batch for value in row],
+            )
+
+
+def apply_book_counts(book_counts):
+    """
+    Add {(day, book_id): counts} to the book summaries and roll them up
+    into the author and daily summaries, reading the authors of the books
+    with one query.
+    """
+    author_counts = defaultdict(new_counts)
+    daily_counts = defaultdict(new_counts)
+    book_authors = defaultdict(list)
+    for book_id, author_id in Book.authors.through.objects.filter(
+        book_id__in={book_id for _, book_id in book_counts}
+    ).values_list("book_id", "author_id"):
+        book_authors[book_id].append(author_id)
+
+    for (day, book_id), values in book_counts.items():
+        for totals in (
+            daily_counts[(day,)],
+            *(author_counts[(day, author_id)] for author_id in book_authors[book_id]),
+        ):
+            for index, value in enumerate(values):
+                totals[index] += value
+
+    add_counts(DailyBookSummary, ["day", "book"], book_counts)
+    add_counts(DailyAuthorSummary, ["day", "author"], author_counts)
+    add_counts(DailySummary, ["day"], daily_counts)
+
+
+def record_borrowings(borrowings):
+    book_counts = defaultdict(new_counts)
+    for borrowing in borrowings:
+        book_counts[(borrowing.borrow_date, borrowing.book_id)][0] += 1
+    apply_book_counts(book_counts)
+
+
+def record_returns(borrowings, daily_fees=None):
+    """
+    Count returns and the fee of each borrowing on its return date. The
+    daily fees of the books, as {book_id: daily_fee}, are read unless given.
+    """
+    if daily_fees is None:
+        daily_fees = dict(
+            Book.objects.filter(
+                id__in={borrowing.book_id for borrowing in borrowings}
+            ).values_list("id", "daily_fee")
+        )
+    book_counts = defaultdict(new_counts)
+    for borrowing in borrowings:
+        days = (borrowing.actual_return_date - borrowing.borrow_date).days
+        counts = book_counts[(borrowing.actual_return_date, borrowing.book_id)]
+        counts[1] += 1
+        counts[2] += days * daily_fees.get(borrowing.book_id, 0)
+    apply_book_counts(book_counts)
+
+
+@transaction.atomic
+def rebuild():
+    """
+    Recompute every summary from the borrowing history with two grouped
+    queries. Returns the number of book summary rows.
+    """
+    for model in (DailySummary, DailyBookSummary, DailyAuthorSummary):
+        model.objects.all().delete()
+
+    book_counts = defaultdict(new_counts)
+    borrows = (
+        Borrowing.objects.order_by()
+        .values("borrow_date", "book_id")
+        .annotate(count=Count("id"))
+        .values_list("borrow_date", "book_id", "count")
+    )
+    for day, book_id, count in borrows:
+        book_counts[(day, book_id)][0] += count
+
+    fee = ExpressionWrapper(
+        DaysBetween(F("actual_return_date"), F("borrow_date")) * F("book__daily_fee"),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+    returns = (
+        Borrowing.objects.filter(actual_return_date__isnull=False)
+        .order_by()
+        .values("actual_return_date", "book_id")
+        .annotate(count=Count("id"), revenue=Sum(fee))
+        .values_list("actual_return_date", "book_id", "count", "revenue")
+    )
+    for day, book_id, count, revenue in returns:
+        counts = book_counts[(day, book_id)]
+        counts[1] += count
+        counts[2] += revenue
+
+    apply_book_counts(book_counts)
+    return len(book_counts)
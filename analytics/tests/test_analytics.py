@@ -0,0 +1,118 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from analytics.models import DailyAuthorSummary, DailyBookSummary, DailySummary
+from books.models import Author
+from books.tests.samples import create_sample_book
+from borrowings.models import Borrowing
+
+BORROWING_URL = reverse("borrowings:borrowing-list")
+BULK_RETURN_URL = reverse("borrowings:borrowing-bulk-return")
+DAILY_URL = reverse("analytics:daily-list")
+BOOKS_URL = reverse("analytics:books-list")
+AUTHORS_URL = reverse("analytics:authors-list")
+
+TODAY = date.today()
+TOMORROW = TODAY + timedelta(days=1)
+
+
+def summary_rows():
+    return {
+        model.__name__: sorted(
+            model.objects.values_list("borrows", "returns", "revenue")
+        )
+        for model in (DailySummary, DailyBookSummary, DailyAuthorSummary)
+    }
+
+
+class CirculationSummaryTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@admin.com", password="qwer1234", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.author = Author.objects.create(first_name="Ivan", last_name="Franko")
+        self.books = [
+            create_sample_book([self.author], title="Moses", daily_fee="1.50"),
+            create_sample_book([self.author], title="Zakhar Berkut", daily_fee="2"),
+        ]
+
+    def borrow(self, book):
+        return self.client.post(
+            BORROWING_URL, {"book": book.id, "expected_return_date": TOMORROW}
+        ).data["id"]
+
+    def test_borrows_and_returns_update_summaries(self):
+        ids = [self.borrow(self.books[0]), self.borrow(self.books[0])]
+        self.borrow(self.books[1])
+        self.client.post(
+            BULK_RETURN_URL,
+            {"ids": ids, "actual_return_date": TOMORROW},
+            format="json",
+        )
+
+        daily = self.client.get(DAILY_URL, {"to": TOMORROW})
+        books = self.client.get(BOOKS_URL, {"to": TOMORROW})
+        authors = self.client.get(AUTHORS_URL, {"to": TOMORROW})
+
+        self.assertEqual(daily.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [dict(row) for row in daily.data["results"]],
+            [
+                {"day": str(TODAY), "borrows": 3, "returns": 0, "revenue": "0.00"},
+                {"day": str(TOMORROW), "borrows": 0, "returns": 2, "revenue": "3.00"},
+            ],
+        )
+        self.assertEqual(
+            [
+                (row["title"], row["borrows"], row["returns"], row["revenue"])
+                for row in books.data["results"]
+            ],
+            [("Moses", 2, 2, "3.00"), ("Zakhar Berkut", 1, 0, "0.00")],
+        )
+        self.assertEqual(
+            [
+                (row["last_name"], row["borrows"], row["returns"], row["revenue"])
+                for row in authors.data["results"]
+            ],
+            [("Franko", 3, 2, "3.00")],
+        )
+
+    def test_rebuild_matches_incremental_summaries(self):
+        ids = [self.borrow(book) for book in self.books]
+        self.client.patch(
+            reverse("borrowings:borrowing-return-borrowing", args=[ids[1]]),
+            {"actual_return_date": TOMORROW},
+        )
+        Borrowing.objects.create(
+            user=self.user, book=self.books[0], expected_return_date=TOMORROW
+        )
+        incremental = summary_rows()
+
+        call_command("rebuild_analytics", stdout=StringIO())
+
+        self.assertEqual(summary_rows(), incremental)
+        self.assertEqual(
+            DailySummary.objects.get(day=TOMORROW).revenue, Decimal("2.00")
+        )
+
+    def test_summaries_access_denied(self):
+        self.client.force_authenticate(None)
+
+        response = self.client.get(DAILY_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_invalid_period(self):
+        response = self.client.get(DAILY_URL, {"from": "yesterday"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,17 @@
+from rest_framework.routers import DefaultRouter
+
+from analytics.views import (
+    AuthorSummaryViewSet,
+    BookSummaryViewSet,
+    DailySummaryViewSet,
+)
+
+router = DefaultRouter()
+
+router.register("daily", DailySummaryViewSet, basename="daily")
+router.register("books", BookSummaryViewSet, basename="books")
+router.register("authors", AuthorSummaryViewSet, basename="authors")
+
+urlpatterns = router.urls
+
+app_name = "analytics"
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+
+from django.db.models import Sum
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import mixins, permissions, serializers, viewsets
+
+from analytics.models import DailyAuthorSummary, DailyBookSummary, DailySummary
+from analytics.serializers import (
+    AuthorSummarySerializer,
+    BookSummarySerializer,
+    DailySummarySerializer,
+)
+
+DEFAULT_PERIOD_DAYS = 30
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="from",
+            description="First day of the period, default 30 days before `to`",
+            type=OpenApiTypes.DATE,
+        ),
+        OpenApiParameter(
+            name="to",
+            description="Last day of the period, default today",
+            type=OpenApiTypes.DATE,
+        ),
+    ]
+)
+class SummaryViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Read-only views over the summary tables, which are kept up to date on
+    every borrow and return, so a request only reads the days it asks for.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get_period(self):
+        field = serializers.DateField()
+        params = self.request.query_params
+        try:
+            end = field.to_internal_value(params["to"]) if "to" in params else None
+            start = (
+                field.to_internal_value(params["from"]) if "from" in params else None
+            )
+        except serializers.ValidationError as error:
+            raise serializers.ValidationError({"period": error.detail})
+        end = end or date.today()
+        start = start or end - timedelta(days=DEFAULT_PERIOD_DAYS - 1)
+        return start, end
+
+    def get_totals(self, queryset, *group_by):
+        return (
+            queryset.filter(day__range=self.get_period())
+            .values(*group_by)
+            .annotate(
+                total_borrows=Sum("borrows"),
+                total_returns=Sum("returns"),
+                total_revenue=Sum("revenue"),
+            )
+            .order_by("-total_borrows", group_by[0])
+        )
+
+
+class DailySummaryViewSet(SummaryViewSet):
+    """Borrows, returns and fee revenue per day"""
+
+    serializer_class = DailySummarySerializer
+
+    def get_queryset(self):
+        return DailySummary.objects.filter(day__range=self.get_period())
+
+
+class BookSummaryViewSet(SummaryViewSet):
+    """Borrows, returns and fee revenue per book over the period"""
+
+    serializer_class = BookSummarySerializer
+
+    def get_queryset(self):
+        return self.get_totals(DailyBookSummary.objects, "book_id", "book__title")
+
+
+class AuthorSummaryViewSet(SummaryViewSet):
+    """Borrows, returns and fee revenue per author over the period"""
+
+    serializer_class = AuthorSummarySerializer
+
+    def get_queryset(self):
+        return self.get_totals(
+            DailyAuthorSummary.objects,
+            "author_id",
+            "author__first_name",
+            "author__last_name",
+        )
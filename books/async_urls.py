@@ -0,0 +1,20 @@
+from books.async_views import (
+    AsyncAuthorDetailView,
+    AsyncAuthorListView,
+    AsyncBookDetailView,
+    AsyncBookListView,
+)
+from books.urls import router
+from library_service.async_views import replace_views
+
+urlpatterns = replace_views(
+    router.urls,
+    {
+        "book-list": AsyncBookListView.as_view(),
+        "book-detail": AsyncBookDetailView.as_view(),
+        "author-list": AsyncAuthorListView.as_view(),
+        "author-detail": AsyncAuthorDetailView.as_view(),
+    },
+)
+
+app_name = "library"
@@ -0,0 +1,107 @@
+from django.core.exceptions import ValidationError
+from django.http import HttpResponseNotModified, JsonResponse
+from rest_framework.exceptions import NotFound
+
+from books import versions
+from books.cache import aget_or_render, etag_matches, get_cache_keys
+from books.models import Author, Book
+from books.serializers import aserialize_book_rows
+from books.views import AuthorViewSet, BookViewSet
+from library_service.async_views import AsyncReadView
+
+NOT_FOUND_ERRORS = (TypeError, ValueError, ValidationError)
+
+
+class AsyncCachedReadView(AsyncReadView):
+    """
+    Serve the data of render() through the catalogue cache with the ETag
+    and cache headers of the viewset, and answer conditional GETs, as
+    CachedResponseMixin does for the sync views
+    """
+
+    async def get(self, request, **kwargs):
+        viewset = self.get_viewset(request, await self.authenticate(request))
+        version_keys = viewset.get_version_keys()
+        key, etag = get_cache_keys(
+            request, version_keys, await versions.aget_versions(version_keys)
+        )
+
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH", "")
+        if etag_matches(etag, if_none_match):
+            response = HttpResponseNotModified()
+        else:
+            data = await aget_or_render(key, lambda: self.render(viewset, **kwargs))
+            # render() raises NotFound, so a representation exists for "*"
+            if if_none_match.strip() == "*":
+                response = HttpResponseNotModified()
+            else:
+                response = JsonResponse(data)
+        return viewset.patch_cached_response(response, etag)
+
+    async def render(self, viewset, **kwargs):
+        raise NotImplementedError
+
+
+class AsyncBookListView(AsyncCachedReadView):
+    viewset = BookViewSet
+    viewset_actions = {"get": "list", "post": "create"}
+    async_query_params = ("page", "page_size", "title", "search")
+
+    async def render(self, viewset):
+        paginator = self.get_paginator(viewset)
+        rows = await paginator.apaginate_queryset(
+            viewset.get_book_rows(), viewset.request
+        )
+        data = await aserialize_book_rows(rows)
+        return paginator.get_paginated_data(data)
+
+
+class AsyncBookDetailView(AsyncCachedReadView):
+    viewset = BookViewSet
+    viewset_actions = {
+        "get": "retrieve",
+        "put": "update",
+        "patch": "partial_update",
+        "delete": "destroy",
+    }
+
+    async def render(self, viewset, pk):
+        try:
+            row = await viewset.get_book_rows().aget(pk=pk)
+        except (Book.DoesNotExist, *NOT_FOUND_ERRORS):
+            raise NotFound()
+        data = await aserialize_book_rows([row])
+        return data[0]
+
+
+class AsyncAuthorListView(AsyncCachedReadView):
+    viewset = AuthorViewSet
+    viewset_actions = {"get": "list", "post": "create"}
+    async_query_params = ("page", "name", "with_counts", "ordering")
+
+    async def render(self, viewset):
+        paginator = self.get_paginator(viewset)
+        fields = viewset.get_serializer_class().Meta.fields
+        rows = await paginator.apaginate_queryset(
+            viewset.get_queryset().values(*fields), viewset.request
+        )
+        return paginator.get_paginated_data(rows)
+
+
+class AsyncAuthorDetailView(AsyncCachedReadView):
+    viewset = AuthorViewSet
+    viewset_actions = {
+        "get": "retrieve",
+        "put": "update",
+        "patch": "partial_update",
+        "delete": "destroy",
+    }
+    async_query_params = ("with_counts",)
+
+    async def render(self, viewset, pk):
+        fields = viewset.get_serializer_class().Meta.fields
+        try:
+            row = await viewset.get_queryset().values(*fields).aget(pk=pk)
+        except (Author.DoesNotExist, *NOT_FOUND_ERRORS):
+            raise NotFound()
+        return row
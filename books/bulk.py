@@ -0,0 +1,97 @@
+from django.db import transaction
+
+from books import inventory, search, versions
+from books.models import Author, Book
+from books.serializers import BookBulkItemSerializer
+
+BULK_BATCH_SIZE = 1000
+BOOK_FIELDS = ["title", "cover", "inventory", "daily_fee"]
+
+
+def validate_books(items):
+    """
+    Validate a list of book payloads, return (valid items, errors).
+
+    Items carrying an id update that book, the others are created. Author
+    and book ids of the whole list are checked with one query each.
+    """
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        serializer = BookBulkItemSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({"index": index, "errors": serializer.errors})
+
+    author_ids = {pk for _, data in valid for pk in data["authors"]}
+    book_ids = [data["id"] for _, data in valid if "id" in data]
+    existing_authors = set(
+        Author.objects.filter(id__in=author_ids).values_list("id", flat=True)
+    )
+    existing_books = set(
+        Book.objects.filter(id__in=book_ids).values_list("id", flat=True)
+    )
+
+    checked, seen_books = [], set()
+    for index, data in valid:
+        item_errors = {}
+        missing_authors = set(data["authors"]) - existing_authors
+        if missing_authors:
+            item_errors["authors"] = [
+                f'Invalid pk "{pk}" - object does not exist.'
+                for pk in sorted(missing_authors)
+            ]
+        if "id" in data:
+            if data["id"] not in existing_books:
+                item_errors["id"] = [f'Book "{data["id"]}" does not exist.']
+            elif data["id"] in seen_books:
+                item_errors["id"] = [f'Book "{data["id"]}" is repeated in the list.']
+            seen_books.add(data["id"])
+
+        if item_errors:
+            errors.append({"index": index, "errors": item_errors})
+        else:
+            checked.append(data)
+
+    errors.sort(key=lambda error: error["index"])
+    return checked, errors
+
+
+@transaction.atomic
+def save_books(items):
+    """
+    Insert and update validated books with bulk queries and link their
+    authors with a single bulk insert, return (created ids, updated ids).
+    """
+    if not items:
+        return [], []
+
+    new_items = [data for data in items if "id" not in data]
+    updated_items = [data for data in items if "id" in data]
+
+    created = Book.objects.bulk_create(
+        [Book(**{field: data[field] for field in BOOK_FIELDS}) for data in new_items],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    updated = [
+        Book(id=data["id"], **{field: data[field] for field in BOOK_FIELDS})
+        for data in updated_items
+    ]
+    Book.objects.bulk_update(updated, BOOK_FIELDS, batch_size=BULK_BATCH_SIZE)
+
+    BookAuthor = Book.authors.through
+    BookAuthor.objects.filter(book_id__in=[book.id for book in updated]).delete()
+    BookAuthor.objects.bulk_create(
+        [
+            BookAuthor(book_id=book.id, author_id=author_id)
+            for book, data in zip(created + updated, new_items + updated_items)
+            for author_id in dict.fromkeys(data["authors"])
+        ],
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+    book_ids = [book.id for book in created + updated]
+    search.index_books(book_ids)
+    versions.bump_books(book_ids)
+    inventory.forget(book.id for book in updated)
+    return [book.id for book in created], [book.id for book in updated]
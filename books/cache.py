@@ -0,0 +1,164 @@
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from books import versions
+from library_service.lru import LRUCache
+from library_service.replicas import primary_reads
+from library_service.stats import Counters
+
+stats = Counters("catalogue_cache", "local_hits", "shared_hits", "misses")
+
+local_cache = LRUCache(settings.CATALOGUE_CACHE_LOCAL_SIZE)
+
+
+def get_or_render(key, render):
+    """
+    Look the response data up in the local LRU, then in the shared cache,
+    and call render() to build it only when both miss.
+    """
+    timeout = settings.CATALOGUE_CACHE_TIMEOUT
+    data = local_cache.get(key)
+    if data is not None:
+        stats.incr("local_hits")
+        return data
+
+    shared_cache = versions.get_cache()
+    data = shared_cache.get(key)
+    if data is not None:
+        stats.incr("shared_hits")
+        local_cache.set(key, data, timeout)
+        return data
+
+    stats.incr("misses")
+    # The data is cached under the current versions, so it must not come
+    # from a replica which lags behind them
+    with primary_reads():
+        data = render()
+    if data is not None:
+        shared_cache.set(key, data, timeout)
+        local_cache.set(key, data, timeout)
+    return data
+
+
+async def aget_or_render(key, arender):
+    """get_or_render() for async views, with an awaitable arender()"""
+    timeout = settings.CATALOGUE_CACHE_TIMEOUT
+    data = local_cache.get(key)
+    if data is not None:
+        stats.incr("local_hits")
+        return data
+
+    shared_cache = versions.get_cache()
+    data = await shared_cache.aget(key)
+    if data is not None:
+        stats.incr("shared_hits")
+        local_cache.set(key, data, timeout)
+        return data
+
+    stats.incr("misses")
+    with primary_reads():
+        data = await arender()
+    if data is not None:
+        await shared_cache.aset(key, data, timeout)
+        local_cache.set(key, data, timeout)
+    return data
+
+
+def get_cache_keys(request, version_keys, version_values):
+    """
+    Cache key of the response data of the request and its ETag, which also
+    depends on the Accept header
+    """
+    version = ":".join(
+        f"{key}={value}" for key, value in zip(version_keys, version_values)
+    )
+    url = request.build_absolute_uri()
+    digest = hashlib.sha1(f"{version}:{url}".encode()).hexdigest()
+    accept = request.META.get("HTTP_ACCEPT", "")
+    etag = '"%s"' % hashlib.sha1(f"{digest}:{accept}".encode()).hexdigest()
+    return f"catalogue:response:{digest}", etag
+
+
+class CachedResponseMixin:
+    """
+    Serve list and retrieve responses from the catalogue cache and answer
+    conditional GETs.
+
+    Keys and ETags include the versions returned by get_version_keys(), by
+    default of the collection (for lists) or the resource (for details), so
+    writes which bump them make old entries unreachable. A matching
+    ``If-None-Match`` gets a 304 after a single version lookup, without
+    touching catalogue rows.
+    """
+
+    cache_collection = None
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs),
+        )
+
+    def get_version_keys(self):
+        if self.action == "retrieve":
+            return [versions.version_key(self.cache_collection, self.kwargs["pk"])]
+        return [versions.version_key(self.cache_collection)]
+
+    def get_cached_response(self, get_response):
+        response = None
+
+        def render():
+            nonlocal response
+            response = get_response()
+            if response.status_code == 200:
+                return response.data
+
+        version_keys = self.get_version_keys()
+        key, etag = get_cache_keys(
+            self.request, version_keys, versions.get_versions(version_keys)
+        )
+
+        if_none_match = self.request.META.get("HTTP_IF_NONE_MATCH", "")
+        if etag_matches(etag, if_none_match):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            data = get_or_render(key, render)
+            response = response or Response(data)
+            # "*" matches any current representation, which only a 200 has
+            if if_none_match.strip() == "*" and response.status_code == 200:
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+
+        return self.patch_cached_response(response, etag)
+
+    def patch_cached_response(self, response, etag):
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            self.patch_cache_headers(response)
+        return response
+
+    def patch_cache_headers(self, response):
+        if self.request.user and self.request.user.is_authenticated:
+            patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+        else:
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=settings.CATALOGUE_HTTP_MAX_AGE,
+                must_revalidate=True,
+            )
+        patch_vary_headers(response, ("Accept", "Authorization"))
+
+
+def etag_matches(etag, if_none_match):
+    """Whether If-None-Match lists the ETag, "*" is left to the caller"""
+    weak_etag = f"W/{etag}"
+    return any(tag in (etag, weak_etag) for tag in parse_etags(if_none_match))
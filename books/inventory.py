@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.db import transaction
+
+from books.models import Book
+from library_service.lru import LRUCache
+from library_service.stats import Counters
+
+stats = Counters("inventory_cache", "hits", "misses")
+
+inventory_cache = LRUCache(settings.BOOK_INVENTORY_CACHE_SIZE)
+
+
+def get_inventory(ids):
+    """
+    Inventory of the books with the given ids as {id: inventory}, read from
+    the in-process cache and with one primary key lookup for the rest.
+    Unknown ids are left out.
+    """
+    ids = list(dict.fromkeys(ids))
+    inventory = inventory_cache.get_many(ids)
+    missing = [book_id for book_id in ids if book_id not in inventory]
+    stats.incr("hits", len(inventory))
+    stats.incr("misses", len(missing))
+
+    if missing:
+        loaded = dict(
+            Book.objects.filter(id__in=missing).values_list("id", "inventory")
+        )
+        inventory_cache.set_many(loaded, settings.BOOK_INVENTORY_CACHE_TIMEOUT)
+        inventory.update(loaded)
+
+    return {book_id: inventory[book_id] for book_id in ids if book_id in inventory}
+
+
+def remember(book_id, inventory):
+    """Cache a saved inventory once its transaction commits"""
+    inventory_cache.delete_many([book_id])
+    transaction.on_commit(
+        lambda: inventory_cache.set(
+            book_id, inventory, settings.BOOK_INVENTORY_CACHE_TIMEOUT
+        )
+    )
+
+
+def forget(ids):
+    """
+    Drop cached inventory of books changed without a model instance, again
+    once the transaction commits so a concurrent read can't cache a value
+    from before it.
+    """
+    ids = list(ids)
+    inventory_cache.delete_many(ids)
+    transaction.on_commit(lambda: inventory_cache.delete_many(ids))
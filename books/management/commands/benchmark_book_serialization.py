@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from books.models import Book
+from books.serializers import (
+    BOOK_LIST_VALUES,
+    BookListRetrieveSerializer,
+    prefetch_authors,
+    serialize_book_rows,
+)
+from library_service.benchmark import format_ms, measure, rolled_back, seed_catalogue
+
+
+class Command(BaseCommand):
+    help = "Compare BookListRetrieveSerializer with the values() fast path"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=5000)
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument("--page-sizes", type=int, nargs="+", default=[100, 1000])
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        with rolled_back():
+            seed_catalogue(options["books"])
+            self.stdout.write(f"Seeded {options['books']} books\n")
+
+            for page_size in options["page_sizes"]:
+                books = Book.objects.order_by("id").prefetch_related(prefetch_authors())
+                rows = Book.objects.order_by("id").values(*BOOK_LIST_VALUES)
+
+                def render_serializer():
+                    page = list(books[:page_size])
+                    data = BookListRetrieveSerializer(page, many=True).data
+                    return renderer.render(data)
+
+                def render_fast():
+                    page = list(rows[:page_size])
+                    return renderer.render(serialize_book_rows(page))
+
+                if render_serializer() != render_fast():
+                    raise CommandError("Fast path output differs from serializer")
+
+                serializer_best, _ = measure(render_serializer, options["repeat"])
+                fast_best, _ = measure(render_fast, options["repeat"])
+                self.stdout.write(
+                    f"page size {page_size:>5}"
+                    f"  serializer {format_ms(serializer_best):>12}"
+                    f"  fast path {format_ms(fast_best):>12}"
+                    f"  x{serializer_best / fast_best:.1f}"
+                )
@@ -0,0 +1,92 @@
+import statistics
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, override_settings
+from django.urls import reverse
+
+from library_service.benchmark import format_ms, measure, rolled_back, seed_catalogue
+from library_service.metrics import MetricsMiddleware
+
+METRICS_MIDDLEWARE = "library_service.metrics.MetricsMiddleware"
+SCENARIOS = [
+    ("without metrics", [m for m in settings.MIDDLEWARE if m != METRICS_MIDDLEWARE]),
+    ("with metrics", settings.MIDDLEWARE),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the overhead of the request metrics middleware on catalogue "
+        "list and detail requests"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=1000)
+        parser.add_argument("--requests", type=int, default=200, help="Per round")
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            book_ids = seed_catalogue(options["books"])
+            self.stdout.write(f"Seeded {options['books']} books\n")
+            urls = [
+                reverse("library:book-detail", args=[book_id])
+                if index % 4
+                else f"{reverse('library:book-list')}?page={index // 4 % 10 + 1}"
+                for index, book_id in enumerate(book_ids[: options["requests"]])
+            ]
+
+            clients = {}
+            for label, middleware in SCENARIOS:
+                with override_settings(MIDDLEWARE=middleware):
+                    # The client loads the middleware on its first request
+                    clients[label] = Client(HTTP_HOST="localhost")
+                    clients[label].get(urls[0])
+
+            # Rounds alternate between the scenarios, so drift affects both
+            durations = {label: [] for label in clients}
+            for _ in range(options["repeat"]):
+                for label, client in clients.items():
+                    durations[label].append(
+                        measure(lambda: [client.get(url) for url in urls], 1)[0]
+                    )
+            results = {
+                label: (min(values), statistics.median(values))
+                for label, values in durations.items()
+            }
+
+            for label, (best, median) in results.items():
+                self.stdout.write(
+                    f"{label:<16}"
+                    f"  best {format_ms(best / len(urls)):>10}"
+                    f"  median {format_ms(median / len(urls)):>10} per request"
+                )
+            baseline, instrumented = results.values()
+            self.stdout.write(
+                f"Overhead {(instrumented[0] / baseline[0] - 1) * 100:+.1f}% (best), "
+                f"{(instrumented[1] / baseline[1] - 1) * 100:+.1f}% (median)"
+            )
+
+        # The difference of whole requests is within their noise, so the
+        # middleware is also timed around a view which does nothing
+        cost = self.middleware_cost()
+        self.stdout.write(
+            f"Middleware {cost * 1e6:.1f} us per request, "
+            f"{cost / baseline[1] * len(urls) * 100:.1f}% of the median request"
+        )
+
+    @staticmethod
+    def middleware_cost(requests=10000):
+        request = RequestFactory().get("/")
+
+        def view(request):
+            return HttpResponse()
+
+        middleware = MetricsMiddleware(view)
+        bare, _ = measure(lambda: [view(request) for _ in range(requests)])
+        instrumented, _ = measure(
+            lambda: [middleware(request) for _ in range(requests)]
+        )
+        return (instrumented - bare) / requests
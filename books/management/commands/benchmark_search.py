@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from books.models import Book
+from books.search import is_search_index_available, search_books
+from library_service.benchmark import format_ms, measure, rolled_back, seed_catalogue
+
+QUERIES = ["river", "silver night", "Shevchenko", "kalomira", "vorlin", "dorsilta"]
+
+
+class Command(BaseCommand):
+    help = "Compare the full-text search index with title__icontains filtering"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=50000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--page-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        if not is_search_index_available():
+            raise CommandError("Full-text search index requires an SQLite database")
+
+        page_size = options["page_size"]
+        with rolled_back():
+            seed_catalogue(options["books"])
+            self.stdout.write(f"Seeded {options['books']} books\n")
+
+            for query in QUERIES:
+                icontains = Book.objects.filter(title__icontains=query)
+                indexed = search_books(Book.objects.all(), query)
+
+                def run_icontains():
+                    icontains.count()
+                    list(icontains.values_list("id", flat=True)[:page_size])
+
+                def run_indexed():
+                    indexed.count()
+                    list(indexed.values_list("id", flat=True)[:page_size])
+
+                icontains_best, _ = measure(run_icontains, options["repeat"])
+                indexed_best, _ = measure(run_indexed, options["repeat"])
+                self.stdout.write(
+                    f"{query!r:20} icontains {format_ms(icontains_best):>12}"
+                    f"  fts5 {format_ms(indexed_best):>12}"
+                    f"  x{icontains_best / indexed_best:.1f}"
+                )
@@ -0,0 +1,211 @@
+import csv
+import json
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+
+from books import search, versions
+from books.models import Author, Book
+
+BOOK_FIELDS = ["title", "cover", "inventory", "daily_fee"]
+AUTHOR_FIELDS = ["first_name", "last_name"]
+
+
+def read_csv(path):
+    """
+    Rows with title, authors, cover, inventory and daily_fee columns where
+    authors are "First Last" names separated by semicolons.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            row["authors"] = [
+                name.strip() for name in (row.get("authors") or "").split(";")
+            ]
+            yield row
+
+
+class InvalidRow(str):
+    """A line which could not be read into a row, with the reason"""
+
+
+def read_jsonl(path):
+    """
+    One book object per line where authors are "First Last" names or
+    objects with first_name and last_name.
+    """
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError as error:
+                    yield InvalidRow(f"Invalid JSON: {error}")
+
+
+def parse_author(author):
+    if isinstance(author, dict):
+        return author.get("first_name", ""), author.get("last_name", "")
+    first_name, _, last_name = str(author).strip().rpartition(" ")
+    return first_name, last_name
+
+
+def clean_row(row):
+    """Validate a row the way Book.full_clean would, without a model instance"""
+    if isinstance(row, InvalidRow):
+        return {}, [], {"row": [str(row)]}
+    if not isinstance(row, dict):
+        return {}, [], {"row": ["Expected a JSON object."]}
+
+    book, errors = {}, {}
+    for name in BOOK_FIELDS:
+        try:
+            book[name] = Book._meta.get_field(name).clean(row.get(name), None)
+        except ValidationError as error:
+            errors[name] = error.messages
+
+    authors, row_authors = [], row.get("authors") or []
+    if not isinstance(row_authors, list):
+        errors["authors"] = ["Expected a list of authors."]
+        row_authors = []
+    for author in row_authors:
+        names = parse_author(author)
+        try:
+            authors.append(
+                tuple(
+                    Author._meta.get_field(field).clean(value, None)
+                    for field, value in zip(AUTHOR_FIELDS, names)
+                )
+            )
+        except ValidationError as error:
+            errors["authors"] = [f"{author!r}: {message}" for message in error.messages]
+    if not authors and "authors" not in errors:
+        errors["authors"] = ["At least one author is required."]
+
+    return book, list(dict.fromkeys(authors)), errors
+
+
+class Command(BaseCommand):
+    help = (
+        "Import books and authors from a CSV or JSONL file in chunks, "
+        "each chunk in its own transaction"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path)
+        parser.add_argument("--format", choices=["csv", "jsonl"])
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument(
+            "--checkpoint",
+            type=Path,
+            help="File recording the next row to import. An import which "
+            "failed is resumed from it when run again with the same file.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or path.suffix.lstrip(".").lower()
+        if file_format not in ("csv", "jsonl"):
+            raise CommandError("Unknown file format, pass --format csv or jsonl")
+        chunk_size = options["chunk_size"]
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size must be positive")
+
+        checkpoint = options["checkpoint"]
+        start_row = 0
+        if checkpoint and checkpoint.exists():
+            start_row = int(checkpoint.read_text())
+            self.stdout.write(f"Resuming from row {start_row + 1}")
+
+        reader = read_csv if file_format == "csv" else read_jsonl
+        rows = islice(reader(path), start_row, None)
+        self.authors = {
+            (first_name, last_name): pk
+            for first_name, last_name, pk in Author.objects.values_list(
+                "first_name", "last_name", "id"
+            )
+        }
+
+        next_row = start_row
+        imported = skipped = 0
+        started = time.perf_counter()
+        try:
+            while chunk := list(islice(rows, chunk_size)):
+                try:
+                    created, errors = self.import_chunk(chunk, first_row=next_row + 1)
+                except DatabaseError as error:
+                    raise CommandError(
+                        f"Chunk starting at row {next_row + 1} failed: {error}. "
+                        + (
+                            "Run the command again with the same --checkpoint to resume."
+                            if checkpoint
+                            else f"Pass --checkpoint to resume from row {next_row + 1}."
+                        )
+                    )
+
+                next_row += len(chunk)
+                imported += created
+                skipped += len(errors)
+                for row_number, row_errors in errors:
+                    self.stderr.write(f"Row {row_number} skipped: {row_errors}")
+                if checkpoint:
+                    checkpoint.write_text(str(next_row))
+
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{next_row} rows read, {imported} books imported, "
+                    f"{imported / max(elapsed, 1e-9):.0f} rows/s"
+                )
+        finally:
+            # Also after a failure, for the chunks which were committed
+            versions.bump_books()
+
+        if checkpoint and checkpoint.exists():
+            checkpoint.unlink()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} books, skipped {skipped} rows "
+                f"in {elapsed:.1f} s ({imported / max(elapsed, 1e-9):.0f} rows/s)"
+            )
+        )
+
+    def import_chunk(self, chunk, first_row):
+        books, book_authors, errors = [], [], []
+        for row_number, row in enumerate(chunk, start=first_row):
+            book, authors, row_errors = clean_row(row)
+            if row_errors:
+                errors.append((row_number, row_errors))
+            else:
+                books.append(Book(**book))
+                book_authors.append(authors)
+
+        new_authors = {
+            names: Author(first_name=names[0], last_name=names[1])
+            for authors in book_authors
+            for names in authors
+            if names not in self.authors
+        }
+
+        def get_author_id(names):
+            if names in new_authors:
+                return new_authors[names].id
+            return self.authors[names]
+
+        with transaction.atomic():
+            Author.objects.bulk_create(new_authors.values())
+            Book.objects.bulk_create(books)
+            Book.authors.through.objects.bulk_create(
+                Book.authors.through(book_id=book.id, author_id=get_author_id(names))
+                for book, authors in zip(books, book_authors)
+                for names in authors
+            )
+            search.index_books([book.id for book in books])
+
+        # Only remember authors once their chunk is committed
+        self.authors.update((names, author.id) for names, author in new_authors.items())
+        return len(books), errors
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from books import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of books from the catalogue tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        database = options["database"]
+        if not search.is_search_index_available(database):
+            raise CommandError("Full-text search index requires an SQLite database")
+
+        with transaction.atomic(using=database):
+            search.rebuild_index(using=database)
+
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt"))
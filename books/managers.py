@@ -0,0 +1,67 @@
+from django.apps import apps
+from django.db import models
+from django.db.models import Count, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Lower
+
+# Sorts after every other character, closes the range of a prefix search
+MAX_CHARACTER = chr(0x10FFFF)
+
+
+def prefix_range(field, prefix):
+    """
+    Case-insensitive prefix match written as a range over LOWER(field),
+    so it can use an index on that expression, unlike LIKE 'prefix%'.
+    """
+    return Q(
+        **{
+            f"{field}__gte": Lower(Value(prefix)),
+            f"{field}__lt": Lower(Value(prefix + MAX_CHARACTER)),
+        }
+    )
+
+
+class AuthorQuerySet(models.QuerySet):
+    def with_counts(self):
+        """Annotate book_count and active_borrowings with a subquery each"""
+        book_authors = self.model.books.through
+        borrowing = apps.get_model("borrowings", "Borrowing")
+
+        books = (
+            book_authors.objects.filter(author_id=OuterRef("pk"))
+            .order_by()
+            .values("author_id")
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        active_borrowings = (
+            borrowing.objects.filter(
+                book__authors=OuterRef("pk"), actual_return_date__isnull=True
+            )
+            .order_by()
+            .values("book__authors")
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        return self.annotate(
+            book_count=Coalesce(Subquery(books), 0),
+            active_borrowings=Coalesce(Subquery(active_borrowings), 0),
+        )
+
+    def name_startswith(self, name):
+        """
+        Authors whose first or last name starts with the given text, or with
+        a first and last name prefix when it has several words.
+        """
+        words = name.split()
+        queryset = self.alias(
+            first_name_lower=Lower("first_name"), last_name_lower=Lower("last_name")
+        )
+        if len(words) > 1:
+            return queryset.filter(
+                prefix_range("first_name_lower", words[0]),
+                prefix_range("last_name_lower", " ".join(words[1:])),
+            )
+        return queryset.filter(
+            prefix_range("first_name_lower", name.strip())
+            | prefix_range("last_name_lower", name.strip())
+        )
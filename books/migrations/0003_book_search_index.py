@@ -0,0 +1,41 @@
+from django.db import migrations
+
+CREATE_INDEX_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_book_fts
+    USING fts5(title, authors, tokenize = 'unicode61 remove_diacritics 2')
+"""
+
+FILL_INDEX_SQL = """
+    INSERT INTO books_book_fts (rowid, title, authors)
+    SELECT book.id, book.title, COALESCE((
+        SELECT group_concat(author.first_name || ' ' || author.last_name, ' ')
+        FROM books_author AS author
+        INNER JOIN books_book_authors AS book_author
+            ON book_author.author_id = author.id
+        WHERE book_author.book_id = book.id
+    ), '')
+    FROM books_book AS book
+"""
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(CREATE_INDEX_SQL)
+    schema_editor.execute(FILL_INDEX_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS books_book_fts")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0002_author_remove_book_author_book_authors"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
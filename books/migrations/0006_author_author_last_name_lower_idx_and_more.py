@@ -0,0 +1,27 @@
+# Generated by Django 4.2.4 on 2026-10-18 16:49
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0005_catalogue_cache_table"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(
+                django.db.models.functions.text.Lower("last_name"),
+                name="author_last_name_lower_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(
+                django.db.models.functions.text.Lower("first_name"),
+                name="author_first_name_lower_idx",
+            ),
+        ),
+    ]
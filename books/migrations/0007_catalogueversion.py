@@ -0,0 +1,25 @@
+# Generated by Django 4.2.4 on 2026-10-18 17:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0006_author_author_last_name_lower_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogueVersion",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("version", models.CharField(max_length=16)),
+            ],
+            options={
+                "db_table": "catalogue_version",
+            },
+        ),
+    ]
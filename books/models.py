@@ -1,11 +1,22 @@
 from django.core import validators
 from django.db import models
+from django.db.models.functions import Lower
+
+from books.managers import AuthorQuerySet
 
 
 class Author(models.Model):
     first_name = models.CharField(max_length=255)
     last_name = models.CharField(max_length=255)
 
+    objects = AuthorQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(Lower("last_name"), name="author_last_name_lower_idx"),
+            models.Index(Lower("first_name"), name="author_first_name_lower_idx"),
+        ]
+
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
@@ -39,6 +50,13 @@ class Book(models.Model):
         ],
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["title"], name="book_title_idx"),
+            models.Index(fields=["inventory"], name="book_inventory_idx"),
+            models.Index(fields=["daily_fee"], name="book_daily_fee_idx"),
+        ]
+
     def save(
         self, force_insert=False, force_update=False, using=None, update_fields=None
     ):
@@ -47,3 +65,13 @@ class Book(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class CatalogueVersion(models.Model):
+    """Version token of a catalogue resource or collection, see books.versions"""
+
+    key = models.CharField(max_length=255, primary_key=True)
+    version = models.CharField(max_length=16)
+
+    class Meta:
+        db_table = "catalogue_version"
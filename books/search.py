@@ -0,0 +1,109 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+from books.models import Author, Book
+
+SEARCH_TABLE = "books_book_fts"
+TOKEN_PATTERN = re.compile(r"\w+")
+INDEX_BATCH_SIZE = 500
+
+BOOK_TABLE = Book._meta.db_table
+AUTHOR_TABLE = Author._meta.db_table
+BOOK_AUTHORS_TABLE = Book.authors.through._meta.db_table
+
+INDEX_ROWS_SQL = f"""
+    INSERT INTO {SEARCH_TABLE} (rowid, title, authors)
+    SELECT book.id, book.title, COALESCE((
+        SELECT group_concat(author.first_name || ' ' || author.last_name, ' ')
+        FROM {AUTHOR_TABLE} AS author
+        INNER JOIN {BOOK_AUTHORS_TABLE} AS book_author
+            ON book_author.author_id = author.id
+        WHERE book_author.book_id = book.id
+    ), '')
+    FROM {BOOK_TABLE} AS book
+"""
+
+
+def is_search_index_available(using="default"):
+    return connections[using].vendor == "sqlite"
+
+
+def build_match_query(text):
+    """
+    Turn free user input into a safe FTS5 query: every word becomes a
+    quoted prefix term and all of them must match.
+    """
+    tokens = TOKEN_PATTERN.findall(text)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def search_books(queryset, text):
+    """Filter the queryset by title and author names, best matches first"""
+    match_query = build_match_query(text)
+    if match_query is None:
+        return queryset.none()
+
+    if not is_search_index_available(queryset.db):
+        filters = Q()
+        for token in TOKEN_PATTERN.findall(text):
+            filters &= (
+                Q(title__icontains=token)
+                | Q(authors__first_name__icontains=token)
+                | Q(authors__last_name__icontains=token)
+            )
+        return queryset.filter(filters).distinct()
+
+    return queryset.extra(
+        tables=[SEARCH_TABLE],
+        where=[
+            f"{SEARCH_TABLE}.rowid = {BOOK_TABLE}.id",
+            f"{SEARCH_TABLE} MATCH %s",
+        ],
+        params=[match_query],
+        select={"search_rank": f"{SEARCH_TABLE}.rank"},
+        order_by=["search_rank", "id"],
+    )
+
+
+def index_books(book_ids, using="default"):
+    """Re-read the given books from the catalogue tables into the index"""
+    if not is_search_index_available(using):
+        return
+    book_ids = list(book_ids)
+    with connections[using].cursor() as cursor:
+        for start in range(0, len(book_ids), INDEX_BATCH_SIZE):
+            batch = book_ids[start : start + INDEX_BATCH_SIZE]
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})", batch
+            )
+            cursor.execute(f"{INDEX_ROWS_SQL} WHERE book.id IN ({placeholders})", batch)
+
+
+def remove_books(book_ids, using="default"):
+    if not is_search_index_available(using):
+        return
+    book_ids = list(book_ids)
+    with connections[using].cursor() as cursor:
+        for start in range(0, len(book_ids), INDEX_BATCH_SIZE):
+            batch = book_ids[start : start + INDEX_BATCH_SIZE]
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})", batch
+            )
+
+
+def rebuild_index(using="default"):
+    """Drop every indexed row and index the whole catalogue again"""
+    if not is_search_index_available(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        cursor.execute(INDEX_ROWS_SQL)
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')"
+        )
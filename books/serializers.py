@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.db.models import Prefetch
 from rest_framework import serializers
 
 from books.models import Book, Author
@@ -9,6 +11,15 @@ class AuthorSerializer(serializers.ModelSerializer):
         fields = ["id", "first_name", "last_name"]
 
 
+class AuthorWithCountsSerializer(AuthorSerializer):
+    book_count = serializers.IntegerField(read_only=True)
+    active_borrowings = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Author
+        fields = ["id", "first_name", "last_name", "book_count", "active_borrowings"]
+
+
 class BookCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
@@ -23,3 +34,71 @@ class BookListRetrieveSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = ["id", "title", "authors", "cover", "inventory", "daily_fee"]
+
+
+BOOK_LIST_VALUES = ["id", "title", "cover", "inventory", "daily_fee"]
+
+
+def prefetch_authors():
+    """Prefetch of book authors in the order of book_author_rows()"""
+    return Prefetch("authors", queryset=Author.objects.order_by("id"))
+
+
+def book_author_rows(book_ids):
+    """(book id, first name, last name) of the authors of the books, by id"""
+    return (
+        Author.objects.filter(books__id__in=book_ids)
+        .order_by("books__id", "id")
+        .values_list("books__id", "first_name", "last_name")
+    )
+
+
+def serialize_book_rows(rows, author_rows=None):
+    """
+    Fast equivalent of BookListRetrieveSerializer(many=True) for rows of
+    ``values(*BOOK_LIST_VALUES)``: author names of all the rows are read
+    with one grouped query instead of per-author ``full_name`` lookups.
+    Pass author_rows when book_author_rows() of the rows were read already.
+    """
+    authors = {row["id"]: [] for row in rows}
+    if author_rows is None:
+        author_rows = book_author_rows(authors)
+    for book_id, first_name, last_name in author_rows:
+        authors[book_id].append(f"{first_name} {last_name}")
+
+    return [
+        {
+            "id": row["id"],
+            "title": row["title"],
+            "authors": authors[row["id"]],
+            "cover": row["cover"],
+            "inventory": row["inventory"],
+            "daily_fee": "{:f}".format(row["daily_fee"]),
+        }
+        for row in rows
+    ]
+
+
+async def aserialize_book_rows(rows):
+    """serialize_book_rows() which reads the authors with the async ORM"""
+    author_rows = [row async for row in book_author_rows({row["id"] for row in rows})]
+    return serialize_book_rows(rows, author_rows)
+
+
+class BookBulkItemSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(min_value=1, required=False)
+    authors = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False
+    )
+
+    class Meta:
+        model = Book
+        fields = ["id", "title", "authors", "cover", "inventory", "daily_fee"]
+
+
+class BookAvailabilitySerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BOOK_AVAILABILITY_MAX_IDS,
+    )
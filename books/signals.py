@@ -1,18 +1,26 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
 
-from books.models import Book
+from books import inventory, search, versions
+from books.models import Author, Book
 from borrowings.models import Borrowing
+from borrowings.signals import books_borrowed, books_returned
 
 
 @receiver(post_save, sender=Borrowing)
 def decrease_inventory_when_borrowing_created(sender, instance, created, **kwargs):
-    if created:
+    if created and not getattr(instance, "_inventory_reserved", False):
         book = instance.book
         book.inventory -= 1
-        book.save()
+        book.save(update_fields=["inventory"])
 
 
 @receiver(pre_save, sender=Borrowing)
@@ -24,4 +32,81 @@ def increase_inventory_when_borrowing_returned(sender, instance, **kwargs):
         else:
             book = instance.book
             book.inventory += 1
-            book.save()
+            book.save(update_fields=["inventory"])
+
+
+@receiver(books_borrowed)
+@receiver(books_returned)
+def update_catalogue_when_inventory_updated(sender, borrowings, **kwargs):
+    book_ids = {borrowing.book_id for borrowing in borrowings}
+    inventory.forget(book_ids)
+    versions.bump_books(book_ids)
+
+
+@receiver(post_save, sender=Book)
+def update_search_index_when_book_saved(sender, instance, update_fields, **kwargs):
+    if update_fields is None or "title" in update_fields:
+        search.index_books([instance.pk])
+
+
+@receiver(post_save, sender=Book)
+def update_inventory_cache_when_book_saved(sender, instance, update_fields, **kwargs):
+    if update_fields is None or "inventory" in update_fields:
+        inventory.remember(instance.pk, instance.inventory)
+
+
+@receiver(post_delete, sender=Book)
+def update_inventory_cache_when_book_deleted(sender, instance, **kwargs):
+    inventory.forget([instance.pk])
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def bump_versions_when_book_changed(sender, instance, **kwargs):
+    versions.bump_books([instance.pk])
+
+
+@receiver(post_delete, sender=Book)
+def update_search_index_when_book_deleted(sender, instance, **kwargs):
+    search.remove_books([instance.pk])
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+def update_catalogue_when_book_authors_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if reverse and action == "pre_clear":
+        instance._book_ids = list(instance.books.values_list("id", flat=True))
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        book_ids = [instance.pk]
+    elif action == "post_clear":
+        book_ids = instance.__dict__.pop("_book_ids", [])
+    else:
+        book_ids = list(pk_set)
+    search.index_books(book_ids)
+    versions.bump_books(book_ids)
+
+
+@receiver(post_save, sender=Author)
+def update_catalogue_when_author_saved(sender, instance, created, **kwargs):
+    versions.bump_authors([instance.pk])
+    if not created:
+        book_ids = list(instance.books.values_list("id", flat=True))
+        search.index_books(book_ids)
+        versions.bump_books(book_ids)
+
+
+@receiver(pre_delete, sender=Author)
+def remember_books_when_author_deleted(sender, instance, **kwargs):
+    instance._book_ids = list(instance.books.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Author)
+def update_catalogue_when_author_deleted(sender, instance, **kwargs):
+    book_ids = instance.__dict__.pop("_book_ids", [])
+    versions.bump_authors([instance.pk])
+    search.index_books(book_ids)
+    versions.bump_books(book_ids)
@@ -0,0 +1,26 @@
+from django.urls import reverse
+
+from books.models import Author, Book
+
+
+def create_sample_author(**params):
+    defaults = {"first_name": "Sample", "last_name": "Sampleson"}
+    defaults.update(params)
+    return Author.objects.create(**defaults)
+
+
+def create_sample_book(authors=None, **params):
+    """A book by authors, or by a new sample author when they are None"""
+    defaults = {"title": "Sample", "cover": "Hard", "inventory": 10, "daily_fee": 1}
+    defaults.update(params)
+    book = Book.objects.create(**defaults)
+    book.authors.set([create_sample_author()] if authors is None else authors)
+    return book
+
+
+def book_detail_url(pk: int):
+    return reverse("library:book-detail", args=[pk])
+
+
+def author_detail_url(pk: int):
+    return reverse("library:author-detail", args=[pk])
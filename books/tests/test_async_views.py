@@ -0,0 +1,96 @@
+import asyncio
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Author, Book
+from books.tests.samples import author_detail_url, book_detail_url
+
+BOOK_URL = reverse("library:book-list")
+AUTHOR_URL = reverse("library:author-list")
+ASYNC_URLCONF = "library_service.async_urls"
+CACHE_HEADERS = ("Content-Type", "ETag", "Cache-Control", "Vary")
+
+
+class AsyncCatalogueViewsTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.author = Author.objects.create(first_name="Ivan", last_name="Franko")
+        other_author = Author.objects.create(first_name="Lesya", last_name="Ukrainka")
+        for index in range(3):
+            book = Book.objects.create(
+                title=f"Book {index}", cover="Hard", inventory=index, daily_fee="1.5"
+            )
+            book.authors.set([self.author, other_author][: index + 1])
+        self.book = book
+
+    def assert_same_responses(self, url, params=None):
+        response = self.client.get(url, params)
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            async_response = self.client.get(url, params)
+
+        self.assertEqual(async_response.status_code, response.status_code)
+        self.assertEqual(async_response.json(), response.json())
+        for header in CACHE_HEADERS:
+            self.assertEqual(async_response.get(header), response.get(header), header)
+        return response
+
+    def test_async_views_are_selected_by_urlconf(self):
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            for url in (BOOK_URL, AUTHOR_URL, book_detail_url(1)):
+                self.assertTrue(asyncio.iscoroutinefunction(resolve(url).func))
+
+    def test_list_books(self):
+        self.assert_same_responses(BOOK_URL)
+        self.assert_same_responses(BOOK_URL, {"title": "book 1"})
+        self.assert_same_responses(BOOK_URL, {"page_size": 2, "page": 2})
+
+    def test_retrieve_book(self):
+        self.assert_same_responses(book_detail_url(self.book.id))
+        self.assert_same_responses(book_detail_url(999))
+
+    def test_list_authors(self):
+        self.assert_same_responses(AUTHOR_URL)
+        self.assert_same_responses(
+            AUTHOR_URL, {"with_counts": "true", "ordering": "-book_count"}
+        )
+        self.assert_same_responses(AUTHOR_URL, {"name": "les"})
+
+    def test_retrieve_author(self):
+        self.assert_same_responses(author_detail_url(self.author.id))
+
+    def test_conditional_requests(self):
+        etag = self.assert_same_responses(book_detail_url(self.book.id))["ETag"]
+
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            response = self.client.get(BOOK_URL)
+            self.assertEqual(response["ETag"], self.client.get(BOOK_URL)["ETag"])
+            not_modified = self.client.get(
+                book_detail_url(self.book.id), HTTP_IF_NONE_MATCH=etag
+            )
+            missing = self.client.get(book_detail_url(999), HTTP_IF_NONE_MATCH="*")
+
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], etag)
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_page(self):
+        self.assert_same_responses(BOOK_URL, {"page": 5})
+
+    def test_other_requests_are_served_by_viewsets(self):
+        admin = get_user_model().objects.create_user(
+            email="admin@admin.com", password="qwer1234", is_staff=True
+        )
+        self.client.force_authenticate(admin)
+
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            response = self.client.post(
+                AUTHOR_URL, {"first_name": "Taras", "last_name": "Shevchenko"}
+            )
+            fields_response = self.client.get(BOOK_URL, {"fields": "id"})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(fields_response.json()["results"][0], {"id": 1})
@@ -1,11 +1,14 @@
+from datetime import date, timedelta
+
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from books.models import Author
+from books.models import Author, Book
 from books.serializers import AuthorSerializer
+from borrowings.models import Borrowing
 
 AUTHOR_URL = reverse("library:author-list")
 
@@ -45,6 +48,72 @@ class NonAdminAuthorApiTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, serializer.data)
 
+    def test_list_authors_with_sparse_fields(self):
+        author = create_sample_author(last_name="Franko")
+
+        response = self.client.get(
+            AUTHOR_URL, {"fields": "id,last_name,book_count", "with_counts": "true"}
+        )
+
+        self.assertEqual(
+            response.data["results"],
+            [{"id": author.id, "last_name": "Franko", "book_count": 0}],
+        )
+
+    def test_filter_authors_by_name_prefix(self):
+        franko = create_sample_author(first_name="Ivan", last_name="Franko")
+        ivanov = create_sample_author(first_name="Petro", last_name="Ivanov")
+        create_sample_author(first_name="Lesya", last_name="Ukrainka")
+
+        def names(name):
+            response = self.client.get(AUTHOR_URL, {"name": name})
+            return [author["id"] for author in response.data["results"]]
+
+        self.assertEqual(names("iva"), [franko.id, ivanov.id])
+        self.assertEqual(names("FRA"), [franko.id])
+        self.assertEqual(names("ivan fr"), [franko.id])
+        self.assertEqual(names("ank"), [])
+
+    def test_name_prefix_search_uses_indexes(self):
+        plan = Author.objects.name_startswith("fr").explain()
+
+        self.assertIn("author_first_name_lower_idx", plan)
+        self.assertIn("author_last_name_lower_idx", plan)
+
+    def test_list_authors_with_counts_ordered_by_count(self):
+        user = get_user_model().objects.create_user(
+            email="reader@library.com", password="qwer1234"
+        )
+        franko = create_sample_author(last_name="Franko")
+        ukrainka = create_sample_author(last_name="Ukrainka")
+        create_sample_author(last_name="Unread")
+        for author, count in [(franko, 2), (ukrainka, 1)]:
+            for _ in range(count):
+                book = Book.objects.create(
+                    title="Sample", cover="Hard", inventory=5, daily_fee=1
+                )
+                book.authors.set([author])
+        Borrowing.objects.create(
+            book=ukrainka.books.first(),
+            user=user,
+            expected_return_date=date.today() + timedelta(days=1),
+        )
+
+        response = self.client.get(AUTHOR_URL, {"ordering": "-active_borrowings"})
+        results = response.data["results"]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [
+                (author["last_name"], author["book_count"], author["active_borrowings"])
+                for author in results
+            ],
+            [("Ukrainka", 1, 1), ("Unread", 0, 0), ("Franko", 2, 0)],
+        )
+
+        response = self.client.get(AUTHOR_URL, {"with_counts": "true"})
+        self.assertEqual(response.data["results"][0]["book_count"], 2)
+
     def test_create_access_denied(self):
         payload = {"first_name": "Ivan", "last_name": "Franko"}
         response = self.client.post(AUTHOR_URL, data=payload)
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.inventory import inventory_cache
+from books.tests.samples import create_sample_book
+
+AVAILABILITY_URL = reverse("library:book-availability")
+
+
+class BookAvailabilityTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        inventory_cache.clear()
+        self.books = [
+            create_sample_book(inventory=inventory) for inventory in (3, 0, 7)
+        ]
+
+    def test_availability_of_many_books(self):
+        ids = ",".join(str(book.id) for book in self.books)
+
+        response = self.client.get(AVAILABILITY_URL, {"ids": f"{ids},999"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(), {str(book.id): book.inventory for book in self.books}
+        )
+
+    def test_availability_by_post(self):
+        response = self.client.post(
+            AVAILABILITY_URL, {"ids": [self.books[1].id]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {str(self.books[1].id): 0})
+
+    def test_invalid_ids(self):
+        for ids in ["", "1,a", "-1"]:
+            response = self.client.get(AVAILABILITY_URL, {"ids": ids})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_too_many_ids(self):
+        ids = list(range(1, settings.BOOK_AVAILABILITY_MAX_IDS + 2))
+
+        response = self.client.post(AVAILABILITY_URL, {"ids": ids}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cached_inventory_is_updated_on_save(self):
+        ids = {"ids": ",".join(str(book.id) for book in self.books)}
+        self.client.get(AVAILABILITY_URL, ids)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(AVAILABILITY_URL, ids)
+        self.assertEqual(len(context.captured_queries), 0)
+
+        book = self.books[0]
+        book.inventory = 1
+        book.save(update_fields=["inventory"])
+        response = self.client.get(AVAILABILITY_URL, ids)
+
+        self.assertEqual(response.json()[str(book.id)], 1)
@@ -1,5 +1,9 @@
+import json
+
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -8,6 +12,7 @@ from books.models import Book, Author
 from books.serializers import BookListRetrieveSerializer
 
 BOOK_URL = reverse("library:book-list")
+BULK_URL = reverse("library:book-bulk")
 
 
 def create_sample_author(**params):
@@ -28,6 +33,10 @@ def book_detail_url(pk: int):
     return reverse("library:book-detail", args=[pk])
 
 
+def export_url(export_format: str):
+    return reverse("library:book-export", args=[export_format])
+
+
 class NonAdminBookApiTest(TestCase):
     def setUp(self) -> None:
         self.client = APIClient()
@@ -66,6 +75,32 @@ class NonAdminBookApiTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, serializer.data)
 
+    def test_list_books_with_sparse_fields(self):
+        book = create_sample_book(title="Sparse")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(BOOK_URL, {"fields": "id,inventory"})
+        catalogue_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if "books_" in query["sql"]
+        ]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"], [{"id": book.id, "inventory": book.inventory}]
+        )
+        # count and page rows, without title columns or an authors prefetch
+        self.assertEqual(len(catalogue_queries), 2)
+        self.assertNotIn("title", catalogue_queries[1])
+
+    def test_retrieve_book_with_sparse_fields(self):
+        book = create_sample_book()
+
+        response = self.client.get(book_detail_url(book.id), {"fields": "authors"})
+
+        self.assertEqual(response.data, {"authors": ["Sample Sampleson"]})
+
     def test_create_access_denied(self):
         payload = {
             "title": "New Book",
@@ -77,6 +112,21 @@ class NonAdminBookApiTest(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_export_access_denied(self):
+        response = self.client.get(export_url("csv"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_access_denied(self):
+        user = get_user_model().objects.create_user(
+            email="user@user.com", password="qwer1234"
+        )
+        self.client.force_authenticate(user)
+
+        response = self.client.post(BULK_URL, data=[], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
 
 class AdminBookApiTest(TestCase):
     def setUp(self) -> None:
@@ -140,3 +190,102 @@ class AdminBookApiTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         for key in payload:
             self.assertEqual(getattr(book, key), payload[key])
+
+    def test_bulk_create_and_update_books(self):
+        author = create_sample_author()
+        book = create_sample_book()
+        payload = [
+            {
+                "title": "First",
+                "authors": [author.id],
+                "cover": "Soft",
+                "inventory": 5,
+                "daily_fee": "1.50",
+            },
+            {
+                "id": book.id,
+                "title": "Renamed",
+                "authors": [author.id, author.id],
+                "cover": "Hard",
+                "inventory": 7,
+                "daily_fee": "2.00",
+            },
+            {"title": "Invalid", "authors": [author.id], "cover": "Paper"},
+            {
+                "title": "Unknown author",
+                "authors": [999],
+                "cover": "Soft",
+                "inventory": 1,
+                "daily_fee": 1,
+            },
+        ]
+
+        response = self.client.post(BULK_URL, data=payload, format="json")
+        book.refresh_from_db()
+        created = Book.objects.get(id=response.data["created"][0])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], [book.id])
+        self.assertEqual([error["index"] for error in response.data["errors"]], [2, 3])
+        self.assertIn("authors", response.data["errors"][1]["errors"])
+        self.assertEqual(book.title, "Renamed")
+        self.assertEqual(list(book.authors.all()), [author])
+        self.assertEqual(created.title, "First")
+        self.assertEqual(list(created.authors.all()), [author])
+
+        search_response = self.client.get(BOOK_URL, {"search": "renamed"})
+        self.assertEqual(search_response.data["results"][0]["id"], book.id)
+
+    def test_bulk_rejects_unknown_book_ids(self):
+        author = create_sample_author()
+        payload = [
+            {
+                "id": 999,
+                "title": "Missing",
+                "authors": [author.id],
+                "cover": "Soft",
+                "inventory": 1,
+                "daily_fee": 1,
+            }
+        ]
+
+        response = self.client.post(BULK_URL, data=payload, format="json")
+
+        self.assertEqual(response.data["created"], [])
+        self.assertEqual(response.data["errors"][0]["index"], 0)
+        self.assertIn("id", response.data["errors"][0]["errors"])
+
+    def test_export_books_as_ndjson(self):
+        authors = [create_sample_author(last_name=name) for name in ("A", "B")]
+        book = create_sample_book(daily_fee="1.50")
+        book.authors.set(authors)
+        create_sample_book()
+
+        response = self.client.get(export_url("ndjson"))
+        rows = [json.loads(line) for line in response.streaming_content]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(
+            rows[0],
+            {
+                "id": book.id,
+                "title": "Sample",
+                "authors": ["Sample A", "Sample B"],
+                "cover": "Hard",
+                "inventory": 10,
+                "daily_fee": "1.50",
+            },
+        )
+
+    def test_export_books_as_csv_prefetches_authors_per_chunk(self):
+        for _ in range(3):
+            create_sample_book()
+
+        with self.assertNumQueries(2):
+            response = self.client.get(export_url("csv"))
+            lines = b"".join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual(lines[0], "id,title,authors,cover,inventory,daily_fee")
+        self.assertEqual(len(lines), 4)
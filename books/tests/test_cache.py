@@ -0,0 +1,185 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books import versions
+from books.cache import local_cache, stats
+from books.models import CatalogueVersion
+from books.tests.samples import (
+    book_detail_url,
+    create_sample_author,
+    create_sample_book,
+)
+from borrowings.models import Borrowing
+
+BOOK_URL = reverse("library:book-list")
+AUTHOR_URL = reverse("library:author-list")
+STATS_URL = reverse("stats")
+
+
+class CatalogueCacheTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        stats.reset()
+
+    def test_repeated_reads_are_served_from_cache(self):
+        book = create_sample_book()
+
+        first = self.client.get(book_detail_url(book.id))
+        second = self.client.get(book_detail_url(book.id))
+        local_cache.clear()
+        third = self.client.get(book_detail_url(book.id))
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first.data, third.data)
+        self.assertEqual(
+            stats.snapshot(), {"local_hits": 1, "shared_hits": 1, "misses": 1}
+        )
+
+    def test_book_write_invalidates_list_and_detail(self):
+        book = create_sample_book()
+        other_book = create_sample_book(title="Other")
+        self.client.get(BOOK_URL)
+        self.client.get(book_detail_url(other_book.id))
+
+        book.title = "Changed"
+        book.save()
+
+        titles = [item["title"] for item in self.client.get(BOOK_URL).data["results"]]
+        self.assertIn("Changed", titles)
+        self.client.get(book_detail_url(other_book.id))
+        self.assertEqual(stats.snapshot()["local_hits"], 1)
+
+    def test_author_changes_invalidate_books(self):
+        book = create_sample_book()
+        author = create_sample_author(first_name="Ivan", last_name="Franko")
+        self.client.get(book_detail_url(book.id))
+
+        book.authors.add(author)
+        response = self.client.get(book_detail_url(book.id))
+        self.assertIn("Ivan Franko", response.data["authors"])
+
+        author.last_name = "Kotliarevsky"
+        author.save()
+        response = self.client.get(book_detail_url(book.id))
+        self.assertIn("Ivan Kotliarevsky", response.data["authors"])
+
+        authors = self.client.get(AUTHOR_URL).data["results"]
+        self.assertIn("Kotliarevsky", [item["last_name"] for item in authors])
+
+    def test_borrowing_invalidates_inventory(self):
+        book = create_sample_book(inventory=5)
+        user = get_user_model().objects.create_user(
+            email="reader@library.com", password="qwer1234"
+        )
+        self.client.get(book_detail_url(book.id))
+
+        Borrowing.objects.create(
+            book=book, user=user, expected_return_date=date.today() + timedelta(1)
+        )
+
+        response = self.client.get(book_detail_url(book.id))
+        self.assertEqual(response.data["inventory"], 4)
+
+    def test_stats_are_exposed_to_admin_only(self):
+        response = self.client.get(STATS_URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        admin = get_user_model().objects.create_user(
+            email="admin_user@admin.com", password="qwer1234", is_staff=True
+        )
+        self.client.force_authenticate(admin)
+        response = self.client.get(STATS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("misses", response.data["catalogue_cache"])
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+    def test_matching_etag_returns_not_modified_without_queries(self):
+        book = create_sample_book()
+        etag = self.client.get(book_detail_url(book.id))["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                book_detail_url(book.id), HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_etag_changes_on_write_and_inventory_change(self):
+        book = create_sample_book(inventory=5)
+        first_etag = self.client.get(BOOK_URL)["ETag"]
+
+        book.inventory = 4
+        book.save()
+        response = self.client.get(BOOK_URL, HTTP_IF_NONE_MATCH=first_etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], first_etag)
+
+    def test_author_collection_etag(self):
+        create_sample_author()
+        etag = self.client.get(AUTHOR_URL)["ETag"]
+
+        response = self.client.get(AUTHOR_URL, HTTP_IF_NONE_MATCH=f"W/{etag}")
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        create_sample_author(first_name="New")
+        response = self.client.get(AUTHOR_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_any_etag_matches_existing_books_only(self):
+        book = create_sample_book()
+
+        response = self.client.get(book_detail_url(book.id), HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(book_detail_url(999), HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cache_control_depends_on_authentication(self):
+        response = self.client.get(BOOK_URL)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("Authorization", response["Vary"])
+
+        user = get_user_model().objects.create_user(
+            email="reader@library.com", password="qwer1234"
+        )
+        self.client.force_authenticate(user)
+        response = self.client.get(BOOK_URL)
+        self.assertIn("private", response["Cache-Control"])
+
+
+class VersionsTest(TestCase):
+    def test_bump_is_one_upsert(self):
+        keys = [versions.version_key(versions.BOOKS, pk) for pk in (1, 2)]
+        old = versions.get_versions(keys)
+
+        with CaptureQueriesContext(connection) as context:
+            versions.bump_books([1, 2])
+
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn("catalogue_cache", context.captured_queries[0]["sql"])
+        new = versions.get_versions(keys)
+        self.assertTrue(all(a != b for a, b in zip(old, new)))
+
+    def test_reads_do_not_create_versions(self):
+        keys = [versions.version_key(versions.BOOKS, 999)]
+
+        response = APIClient().get(book_detail_url(999))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(versions.get_versions(keys), [versions.INITIAL_VERSION])
+        self.assertFalse(CatalogueVersion.objects.exists())
@@ -0,0 +1,84 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books import versions
+from books.models import Author
+from books.tests.samples import book_detail_url, create_sample_book
+
+BOOK_URL = reverse("library:book-list")
+
+
+class FastBookSerializationTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        authors = [
+            Author.objects.create(first_name=first_name, last_name=last_name)
+            for first_name, last_name in [("Ivan", "Franko"), ("Lesya", "Ukrainka")]
+        ]
+        self.books = [
+            create_sample_book(authors, title="Forest song", daily_fee="0.50"),
+            create_sample_book(authors[:1], title="Moses", daily_fee=12),
+            create_sample_book([], title="Anonymous", cover="Soft", inventory=0),
+        ]
+
+    def get_both(self, url, params=None):
+        """Return the slow and the fast response bodies of the same request"""
+        responses = []
+        for fast in (False, True):
+            versions.bump_books()
+            with override_settings(CATALOGUE_FAST_SERIALIZATION=fast):
+                response = self.client.get(url, params, HTTP_ACCEPT="application/json")
+            responses.append((response.status_code, response.content))
+        return responses
+
+    def test_list_output_is_identical(self):
+        slow, fast = self.get_both(BOOK_URL)
+
+        self.assertEqual(slow[0], status.HTTP_200_OK)
+        self.assertEqual(slow, fast)
+
+    def test_filtered_and_keyset_output_is_identical(self):
+        for params in [
+            {"title": "o"},
+            {"search": "franko"},
+            {"pagination": "keyset", "ordering": "-daily_fee", "page_size": 2},
+        ]:
+            slow, fast = self.get_both(BOOK_URL, params)
+            self.assertEqual(slow, fast)
+
+    def test_retrieve_output_is_identical(self):
+        slow, fast = self.get_both(book_detail_url(self.books[0].id))
+        self.assertEqual(slow, fast)
+
+        slow, fast = self.get_both(book_detail_url(999))
+        self.assertEqual(fast[0], status.HTTP_404_NOT_FOUND)
+        self.assertEqual(slow, fast)
+
+    def test_authors_are_listed_in_the_same_order(self):
+        authors = [
+            Author.objects.create(first_name="Author", last_name=str(index))
+            for index in range(4)
+        ]
+        book = create_sample_book([authors[2], authors[0], authors[3], authors[1]])
+
+        slow, fast = self.get_both(book_detail_url(book.id))
+
+        self.assertEqual(slow, fast)
+        self.assertIn(b'"Author 0","Author 1","Author 2","Author 3"', fast[1])
+
+    @override_settings(CATALOGUE_FAST_SERIALIZATION=True)
+    def test_fast_list_reads_authors_with_one_query(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(BOOK_URL)
+
+        catalogue_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if "books_" in query["sql"]
+        ]
+        # count, page rows and authors of the page
+        self.assertEqual(len(catalogue_queries), 3)
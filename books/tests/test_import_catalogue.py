@@ -0,0 +1,137 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError
+from django.test import TestCase
+
+from books.models import Author, Book
+
+CSV_HEADER = "title,authors,cover,inventory,daily_fee\n"
+
+
+class ImportCatalogueTest(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_file(self, name, content):
+        path = Path(self.directory.name) / name
+        path.write_text(content)
+        return path
+
+    def import_catalogue(self, *args, **options):
+        call_command(
+            "import_catalogue", *args, stdout=StringIO(), stderr=StringIO(), **options
+        )
+
+    def test_import_csv_deduplicates_authors(self):
+        existing = Author.objects.create(first_name="Ivan", last_name="Franko")
+        path = self.write_file(
+            "books.csv",
+            CSV_HEADER
+            + "Zakhar Berkut,Ivan Franko,Hard,3,1.50\n"
+            + "Moses,Ivan Franko; Lesya Ukrainka,Soft,2,2\n"
+            + "Forest song,Lesya Ukrainka,Soft,1,0.5\n",
+        )
+
+        self.import_catalogue(path, chunk_size=2)
+
+        self.assertEqual(Book.objects.count(), 3)
+        self.assertEqual(Author.objects.count(), 2)
+        moses = Book.objects.get(title="Moses")
+        self.assertEqual(
+            sorted(author.full_name for author in moses.authors.all()),
+            ["Ivan Franko", "Lesya Ukrainka"],
+        )
+        self.assertIn(existing, moses.authors.all())
+
+    def test_import_jsonl_skips_invalid_rows(self):
+        rows = [
+            {
+                "title": "Kobzar",
+                "authors": [{"first_name": "Taras", "last_name": "Shevchenko"}],
+                "cover": "Hard",
+                "inventory": 4,
+                "daily_fee": "0.99",
+            },
+            {"title": "No authors", "authors": [], "cover": "Hard"},
+            {
+                "title": "Negative",
+                "authors": ["Taras Shevchenko"],
+                "cover": "Paper",
+                "inventory": -1,
+                "daily_fee": "100.00",
+            },
+        ]
+        path = self.write_file(
+            "books.jsonl", "\n".join(json.dumps(row) for row in rows)
+        )
+        stderr = StringIO()
+
+        call_command("import_catalogue", path, stdout=StringIO(), stderr=stderr)
+
+        self.assertEqual(list(Book.objects.values_list("title", flat=True)), ["Kobzar"])
+        self.assertIn("Row 2 skipped", stderr.getvalue())
+        self.assertIn("Row 3 skipped", stderr.getvalue())
+        self.assertIn("inventory", stderr.getvalue())
+
+    def test_import_jsonl_skips_unreadable_lines(self):
+        path = self.write_file(
+            "books.jsonl",
+            '{"title": "Broken",\n'
+            '["Not", "an", "object"]\n'
+            '{"title": "Kobzar", "authors": 1, "cover": "Hard"}\n'
+            '{"title": "Kobzar", "authors": ["Taras Shevchenko"], "cover": "Hard", '
+            '"inventory": 1, "daily_fee": "0.99"}\n',
+        )
+        stderr = StringIO()
+
+        call_command("import_catalogue", path, stdout=StringIO(), stderr=stderr)
+
+        self.assertEqual(list(Book.objects.values_list("title", flat=True)), ["Kobzar"])
+        self.assertIn("Row 1 skipped: {'row': ['Invalid JSON", stderr.getvalue())
+        self.assertIn(
+            "Row 2 skipped: {'row': ['Expected a JSON object.']}", stderr.getvalue()
+        )
+        self.assertIn("Expected a list of authors.", stderr.getvalue())
+
+    def test_resume_from_checkpoint_after_failed_chunk(self):
+        path = self.write_file(
+            "books.csv",
+            CSV_HEADER
+            + "".join(f"Book {index},Anna Smith,Hard,1,1\n" for index in range(5)),
+        )
+        checkpoint = Path(self.directory.name) / "checkpoint"
+        bulk_create = Book.objects.bulk_create
+        calls = []
+
+        def failing_bulk_create(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 2:
+                raise DatabaseError("disk I/O error")
+            return bulk_create(*args, **kwargs)
+
+        with mock.patch.object(
+            Book.objects, "bulk_create", failing_bulk_create
+        ), mock.patch("books.versions.bump_books") as bump_books:
+            with self.assertRaises(CommandError):
+                self.import_catalogue(path, chunk_size=2, checkpoint=checkpoint)
+
+        # The books of the first chunk are visible in cached responses
+        bump_books.assert_called_once_with()
+        self.assertEqual(checkpoint.read_text(), "2")
+        self.assertEqual(Book.objects.count(), 2)
+
+        self.import_catalogue(path, chunk_size=2, checkpoint=checkpoint)
+
+        self.assertEqual(
+            list(Book.objects.order_by("id").values_list("title", flat=True)),
+            [f"Book {index}" for index in range(5)],
+        )
+        self.assertEqual(Author.objects.count(), 1)
+        self.assertFalse(checkpoint.exists())
@@ -0,0 +1,100 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.tests.samples import book_detail_url, create_sample_book
+from library_service import metrics
+
+BOOK_URL = reverse("library:book-list")
+METRICS_URL = reverse("metrics")
+ASYNC_URLCONF = "library_service.async_urls"
+SERVER_TIMING = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries", total;dur=[\d.]+')
+
+
+class RequestMetricsTest(TestCase):
+    def setUp(self) -> None:
+        for histogram in metrics.Histogram.registry:
+            histogram.reset()
+        self.client = APIClient()
+        self.book = create_sample_book()
+
+    def assert_server_timing_queries(self, response, queries):
+        match = SERVER_TIMING.fullmatch(response["Server-Timing"])
+        self.assertIsNotNone(match, response["Server-Timing"])
+        self.assertEqual(int(match.group(1)), queries)
+
+    def test_server_timing_counts_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(BOOK_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assert_server_timing_queries(response, len(context.captured_queries))
+
+    def test_metrics_per_view(self):
+        self.client.get(BOOK_URL)
+        self.client.get(BOOK_URL)
+        self.client.get(book_detail_url(self.book.id))
+
+        self.assertEqual(
+            metrics.request_duration.snapshot()["BookViewSet.list"][0][-1], 0
+        )
+        self.assertEqual(
+            {
+                view: sum(counts)
+                for view, (counts, _) in metrics.db_queries.snapshot().items()
+            },
+            {"BookViewSet.list": 2, "BookViewSet.retrieve": 1},
+        )
+
+    def test_metrics_are_exposed_to_admin_only(self):
+        response = self.client.get(METRICS_URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        admin = get_user_model().objects.create_user(
+            email="admin_user@admin.com", password="qwer1234", is_staff=True
+        )
+        self.client.force_authenticate(admin)
+        self.client.get(BOOK_URL)
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], metrics.CONTENT_TYPE)
+        body = response.content.decode()
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+        self.assertIn(
+            'http_request_duration_seconds_count{view="BookViewSet.list"} 1', body
+        )
+        self.assertIn(
+            'http_request_db_queries_bucket{view="BookViewSet.list",le="+Inf"} 1', body
+        )
+
+    @override_settings(ROOT_URLCONF=ASYNC_URLCONF)
+    async def test_async_views_queries_are_counted(self):
+        response = await AsyncClient().get(book_detail_url(self.book.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        match = SERVER_TIMING.fullmatch(response["Server-Timing"])
+        self.assertGreater(int(match.group(1)), 0)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram("test_seconds", "Test.", "view", (0.1, 1))
+        self.addCleanup(metrics.Histogram.registry.remove, histogram)
+        for value in (0.05, 0.5, 0.7, 3):
+            histogram.observe("View.get", value)
+
+        self.assertEqual(
+            histogram.render().splitlines()[2:],
+            [
+                'test_seconds_bucket{view="View.get",le="0.1"} 1',
+                'test_seconds_bucket{view="View.get",le="1.0"} 3',
+                'test_seconds_bucket{view="View.get",le="+Inf"} 4',
+                'test_seconds_sum{view="View.get"} 4.25',
+                'test_seconds_count{view="View.get"} 4',
+            ],
+        )
@@ -0,0 +1,89 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from library_service.pagination import KeysetPagination
+from books.tests.samples import create_sample_book
+
+BOOK_URL = reverse("library:book-list")
+
+
+def collect_pages(client, params):
+    pages = []
+    response = client.get(BOOK_URL, params)
+    while True:
+        pages.append(response)
+        if not response.data["next"]:
+            return pages
+        response = client.get(response.data["next"])
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+    def test_keyset_pages_follow_ordering_key_and_id(self):
+        for title in ["B", "A", "C", "A", "B", "A"]:
+            create_sample_book(title=title)
+        expected = list(
+            Book.objects.order_by("-title", "-id").values_list("id", flat=True)
+        )
+
+        pages = collect_pages(
+            self.client, {"pagination": "keyset", "ordering": "-title", "page_size": 4}
+        )
+
+        self.assertEqual(len(pages), 2)
+        self.assertNotIn("count", pages[0].data)
+        self.assertEqual(
+            [book["id"] for page in pages for book in page.data["results"]], expected
+        )
+
+    def test_keyset_count_is_optional_and_cached(self):
+        create_sample_book()
+        params = {"pagination": "keyset", "count": "true", "page_size": 1}
+
+        first = self.client.get(BOOK_URL, params)
+        create_sample_book()
+        second = self.client.get(BOOK_URL, params)
+
+        self.assertEqual(first.data["count"], 1)
+        self.assertEqual(second.data["count"], 1)
+        self.assertIsNotNone(second.data["next"])
+
+    def test_unknown_ordering_falls_back_to_id(self):
+        second = create_sample_book(title="A")
+        first = create_sample_book(title="B")
+
+        response = self.client.get(
+            BOOK_URL, {"pagination": "keyset", "ordering": "cover"}
+        )
+
+        self.assertEqual(
+            [book["id"] for book in response.data["results"]], [second.id, first.id]
+        )
+
+    def test_invalid_cursor(self):
+        response = self.client.get(BOOK_URL, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_value_of_wrong_type(self):
+        for ordering, value in [("inventory", "abc"), ("daily_fee", "abc")]:
+            cursor = KeysetPagination.encode_cursor([value, 1])
+
+            response = self.client.get(
+                BOOK_URL, {"ordering": ordering, "cursor": cursor}
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_pagination_is_default(self):
+        create_sample_book()
+
+        response = self.client.get(BOOK_URL)
+
+        self.assertEqual(response.data["count"], 1)
+        self.assertIn("previous", response.data)
@@ -0,0 +1,76 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.search import SEARCH_TABLE, build_match_query
+from books.tests.samples import create_sample_author, create_sample_book
+
+BOOK_URL = reverse("library:book-list")
+
+
+def search_ids(client, text):
+    response = client.get(BOOK_URL, {"search": text})
+    return [book["id"] for book in response.data["results"]]
+
+
+class BookSearchTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+    def test_build_match_query_escapes_user_input(self):
+        self.assertEqual(build_match_query('war "and* peace'), '"war"* "and"* "peace"*')
+        self.assertIsNone(build_match_query('"*'))
+
+    def test_search_by_title_and_author_name(self):
+        franko = create_sample_author(first_name="Ivan", last_name="Franko")
+        by_title = create_sample_book(title="Zakhar Berkut")
+        by_author = create_sample_book(title="Moses", authors=[franko])
+        create_sample_book(title="Kobzar")
+
+        self.assertEqual(search_ids(self.client, "berkut"), [by_title.id])
+        self.assertEqual(search_ids(self.client, "fran"), [by_author.id])
+        self.assertEqual(search_ids(self.client, "ivan moses"), [by_author.id])
+
+    def test_search_ranks_better_matches_first(self):
+        weak = create_sample_book(title="Forest song and other plays of many acts")
+        strong = create_sample_book(title="Forest forest")
+
+        response = self.client.get(BOOK_URL, {"search": "forest"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(
+            [book["id"] for book in response.data["results"]], [strong.id, weak.id]
+        )
+
+    def test_index_follows_book_and_author_changes(self):
+        author = create_sample_author(first_name="Lesya", last_name="Ukrainka")
+        book = create_sample_book(title="Forest song", authors=[author])
+
+        book.title = "Stone host"
+        book.save()
+        author.last_name = "Kosach"
+        author.save()
+
+        self.assertEqual(search_ids(self.client, "forest"), [])
+        self.assertEqual(search_ids(self.client, "stone kosach"), [book.id])
+
+        book.authors.clear()
+        self.assertEqual(search_ids(self.client, "kosach"), [])
+
+        book.delete()
+        self.assertEqual(search_ids(self.client, "stone"), [])
+
+    def test_rebuild_search_index_command(self):
+        book = create_sample_book(title="Eneida")
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertEqual(search_ids(self.client, "eneida"), [book.id])
@@ -0,0 +1,70 @@
+"""
+Versions of catalogue resources and collections.
+
+Every write to a book or an author replaces the version of the resource and
+of its collection with a new random token. Anything derived from catalogue
+data (cached responses, ETags) includes the versions it depends on in its
+key, so a bump invalidates it without having to find and delete entries.
+
+Versions live in the CatalogueVersion table, so every worker process sees
+the same ones and writers bump them with a single upsert. Keys which were
+never bumped have INITIAL_VERSION without a row, so reads never write.
+"""
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+
+from books.models import CatalogueVersion
+
+BOOKS = "books"
+AUTHORS = "authors"
+INITIAL_VERSION = "0"
+
+
+def get_cache():
+    return caches[settings.CATALOGUE_CACHE_ALIAS]
+
+
+def version_key(collection, pk=None):
+    if pk is None:
+        return f"catalogue:version:{collection}"
+    return f"catalogue:version:{collection}:{pk}"
+
+
+def new_version():
+    return uuid4().hex[:16]
+
+
+def version_rows(keys):
+    return CatalogueVersion.objects.filter(key__in=keys).values_list("key", "version")
+
+
+def get_versions(keys):
+    """Return versions of the given keys"""
+    versions = dict(version_rows(keys))
+    return [versions.get(key, INITIAL_VERSION) for key in keys]
+
+
+async def aget_versions(keys):
+    """get_versions() with the async ORM"""
+    versions = {key: version async for key, version in version_rows(keys)}
+    return [versions.get(key, INITIAL_VERSION) for key in keys]
+
+
+def bump(collection, pks=()):
+    keys = [version_key(collection)] + [version_key(collection, pk) for pk in pks]
+    CatalogueVersion.objects.bulk_create(
+        [CatalogueVersion(key=key, version=new_version()) for key in keys],
+        update_conflicts=True,
+        unique_fields=["key"],
+        update_fields=["version"],
+    )
+
+
+def bump_books(book_ids=()):
+    bump(BOOKS, book_ids)
+
+
+def bump_authors(author_ids=()):
+    bump(AUTHORS, author_ids)
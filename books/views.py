@@ -1,43 +1,279 @@
+from django.conf import settings
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
-from rest_framework import viewsets
+from rest_framework import viewsets, status
 from rest_framework import permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
 
+from books import inventory, versions
+from books.bulk import save_books, validate_books
+from books.cache import CachedResponseMixin
 from books.models import Author, Book
 from books.permissions import IsAdminOrReadOnly
+from books.search import search_books
 from books.serializers import (
+    BOOK_LIST_VALUES,
     AuthorSerializer,
+    AuthorWithCountsSerializer,
+    BookAvailabilitySerializer,
     BookCreateSerializer,
     BookListRetrieveSerializer,
+    BookBulkItemSerializer,
+    prefetch_authors,
+    serialize_book_rows,
 )
+from library_service.export import EXPORT_CHUNK_SIZE, export_response
+from library_service.pagination import KeysetPagination
+from library_service.sparse import SparseFieldsetMixin
 
+BOOK_EXPORT_COLUMNS = ["id", "title", "authors", "cover", "inventory", "daily_fee"]
 
-class AuthorViewSet(viewsets.ModelViewSet):
+
+class AuthorViewSet(CachedResponseMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
+    cache_collection = versions.AUTHORS
     queryset = Author.objects.all()
     serializer_class = AuthorSerializer
     permission_classes = [IsAdminOrReadOnly]
+    ordering_fields = ("first_name", "last_name", "book_count", "active_borrowings")
+    count_fields = ("book_count", "active_borrowings")
+    sparse_field_columns = {"first_name": ["first_name"], "last_name": ["last_name"]}
+
+    def get_queryset(self):
+        queryset = Author.objects.all()
+        name = self.request.query_params.get("name")
+        ordering = self.get_ordering()
+
+        if name:
+            queryset = queryset.name_startswith(name)
+        if self.with_counts():
+            queryset = queryset.with_counts()
+
+        return self.project_queryset(queryset).order_by(*ordering)
+
+    def get_ordering(self):
+        ordering = self.request.query_params.get("ordering", "")
+        if ordering.lstrip("-") not in self.ordering_fields:
+            return ["id"]
+        return [ordering, "-id" if ordering.startswith("-") else "id"]
+
+    def with_counts(self):
+        if self.action not in ("list", "retrieve"):
+            return False
+        with_counts = self.request.query_params.get("with_counts", "")
+        ordering = self.request.query_params.get("ordering", "")
+        return (
+            with_counts.lower() == "true" or ordering.lstrip("-") in self.count_fields
+        )
+
+    def get_serializer_class(self):
+        if self.with_counts():
+            return AuthorWithCountsSerializer
+        return AuthorSerializer
+
+    def get_version_keys(self):
+        version_keys = super(AuthorViewSet, self).get_version_keys()
+        if self.with_counts():
+            # Counts change with books and their inventory
+            version_keys.append(versions.version_key(versions.BOOKS))
+        return version_keys
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="name",
+                description="Filter by first or last name prefix, "
+                "or by first and last name prefixes",
+                type=str,
+            ),
+            OpenApiParameter(
+                name="with_counts",
+                description="Add book_count and active_borrowings",
+                type=bool,
+            ),
+            OpenApiParameter(
+                name="ordering",
+                description="One of first_name, last_name, book_count, "
+                "active_borrowings; prefix with `-` for descending order",
+                type=str,
+            ),
+            *SparseFieldsetMixin.get_sparse_schema_parameters(),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        """For documentation purposes"""
+        return super(AuthorViewSet, self).list(request, *args, **kwargs)
+
+
+class FastBookReadMixin:
+    """
+    With CATALOGUE_FAST_SERIALIZATION enabled, build list and retrieve
+    responses from values() rows with serialize_book_rows() instead of
+    model instances and BookListRetrieveSerializer. The output is the same.
+    Sparse fieldset requests always take the serializer path.
+    """
 
+    def use_fast_serialization(self):
+        return (
+            settings.CATALOGUE_FAST_SERIALIZATION
+            and self.get_sparse_fields() is None
+            and self.get_expanded_fields() is None
+        )
 
-class BookViewSet(viewsets.ModelViewSet):
-    queryset = Book.objects.all().prefetch_related("authors")
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_serialization():
+            return super(FastBookReadMixin, self).list(request, *args, **kwargs)
+
+        queryset = self.get_book_rows()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize_book_rows(page))
+        return Response(serialize_book_rows(list(queryset)))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_fast_serialization():
+            return super(FastBookReadMixin, self).retrieve(request, *args, **kwargs)
+
+        row = get_object_or_404(self.get_book_rows(), pk=self.kwargs["pk"])
+        self.check_object_permissions(request, row)
+        return Response(serialize_book_rows([row])[0])
+
+    def get_book_rows(self):
+        return (
+            self.filter_queryset(self.get_queryset())
+            .prefetch_related(None)
+            .values(*BOOK_LIST_VALUES)
+        )
+
+
+class BookViewSet(
+    CachedResponseMixin,
+    SparseFieldsetMixin,
+    FastBookReadMixin,
+    viewsets.ModelViewSet,
+):
+    cache_collection = versions.BOOKS
+    queryset = Book.objects.all().prefetch_related(prefetch_authors())
     permission_classes = [IsAdminOrReadOnly]
+    pagination_class = KeysetPagination
+    keyset_ordering_fields = ("title", "inventory", "daily_fee")
+    sparse_field_columns = {
+        "title": ["title"],
+        "cover": ["cover"],
+        "inventory": ["inventory"],
+        "daily_fee": ["daily_fee"],
+    }
 
     def get_queryset(self):
-        queryset = Book.objects.all().prefetch_related("authors")
+        queryset = self.project_queryset(Book.objects.all())
+        if self.is_field_needed("authors"):
+            queryset = queryset.prefetch_related(prefetch_authors())
         title = self.request.query_params.get("title")
+        search = self.request.query_params.get("search")
 
         if title:
             queryset = queryset.filter(title__icontains=title)
+        if search:
+            queryset = search_books(queryset, search)
 
         return queryset
 
     def get_serializer_class(self):
         if self.action in ("create", "update", "partial_update"):
             return BookCreateSerializer
+        if self.action == "bulk":
+            return BookBulkItemSerializer
+        if self.action == "availability":
+            return BookAvailabilitySerializer
         return BookListRetrieveSerializer
 
+    def get_permissions(self):
+        if self.action in ("bulk", "export"):
+            self.permission_classes = [permissions.IsAdminUser]
+        if self.action == "availability":
+            self.permission_classes = [permissions.AllowAny]
+
+        return super(BookViewSet, self).get_permissions()
+
+    @extend_schema(request=BookBulkItemSerializer(many=True))
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Create books without id and update books with id in one request"""
+        if not isinstance(request.data, list):
+            raise ValidationError("Expected a list of books")
+
+        books, errors = validate_books(request.data)
+        created, updated = save_books(books)
+
+        return Response(
+            {"created": created, "updated": updated, "errors": errors},
+            status=status.HTTP_200_OK,
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="ids",
+                description="Comma separated book ids, or POST them as "
+                '`{"ids": [...]}` when they don\'t fit in the URL',
+                type=str,
+            )
+        ],
+        responses={
+            200: {"type": "object", "additionalProperties": {"type": "integer"}}
+        },
+    )
+    @action(detail=False, methods=["get", "post"])
+    def availability(self, request):
+        """Inventory of many books at once as {id: inventory}"""
+        if request.method == "GET":
+            ids = request.query_params.get("ids", "")
+            data = {"ids": [book_id for book_id in ids.split(",") if book_id]}
+        else:
+            data = request.data
+        serializer = self.get_serializer(data=data)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(inventory.get_inventory(serializer.validated_data["ids"]))
+
+    @extend_schema(responses=OpenApiTypes.STR)
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"export/(?P<export_format>ndjson|csv)",
+    )
+    def export(self, request, export_format):
+        """Stream the whole catalogue as NDJSON or CSV"""
+        books = (
+            Book.objects.order_by("id")
+            .prefetch_related(prefetch_authors())
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        rows = (
+            {
+                "id": book.id,
+                "title": book.title,
+                "authors": [author.full_name for author in book.authors.all()],
+                "cover": book.cover,
+                "inventory": book.inventory,
+                "daily_fee": book.daily_fee,
+            }
+            for book in books
+        )
+        return export_response(rows, BOOK_EXPORT_COLUMNS, export_format, "books")
+
     @extend_schema(
         parameters=[
-            OpenApiParameter(name="title", description="Filter by title", type=str)
+            OpenApiParameter(name="title", description="Filter by title", type=str),
+            OpenApiParameter(
+                name="search",
+                description="Full-text search by title and author names, "
+                "best matches first",
+                type=str,
+            ),
+            *SparseFieldsetMixin.get_sparse_schema_parameters(),
         ]
     )
     def list(self, request, *args, **kwargs):
@@ -0,0 +1,9 @@
+from borrowings.async_views import AsyncBorrowingListView
+from borrowings.urls import router
+from library_service.async_views import replace_views
+
+urlpatterns = replace_views(
+    router.urls, {"borrowing-list": AsyncBorrowingListView.as_view()}
+)
+
+app_name = "borrowings"
@@ -0,0 +1,51 @@
+from django.http import JsonResponse
+from rest_framework.exceptions import NotAuthenticated
+
+from books.serializers import BOOK_LIST_VALUES, aserialize_book_rows
+from borrowings.views import BorrowingViewSet
+from library_service.async_views import AsyncReadView
+
+BORROWING_LIST_VALUES = [
+    "id",
+    "borrow_date",
+    "expected_return_date",
+    "actual_return_date",
+    "user",
+    *(f"book__{field}" for field in BOOK_LIST_VALUES),
+]
+
+
+class AsyncBorrowingListView(AsyncReadView):
+    viewset = BorrowingViewSet
+    viewset_actions = {"get": "list", "post": "create"}
+    async_query_params = ("page", "page_size", "is_active", "users")
+
+    async def get(self, request):
+        user = await self.authenticate(request)
+        if user is None:
+            raise NotAuthenticated()
+        viewset = self.get_viewset(request, user)
+        paginator = self.get_paginator(viewset)
+        queryset = (
+            viewset.get_queryset().prefetch_related(None).values(*BORROWING_LIST_VALUES)
+        )
+        rows = await paginator.apaginate_queryset(queryset, viewset.request)
+
+        books = await aserialize_book_rows(
+            [
+                {field: row[f"book__{field}"] for field in BOOK_LIST_VALUES}
+                for row in rows
+            ]
+        )
+        data = [
+            {
+                "id": row["id"],
+                "borrow_date": row["borrow_date"],
+                "expected_return_date": row["expected_return_date"],
+                "actual_return_date": row["actual_return_date"],
+                "book": book,
+                "user": row["user"],
+            }
+            for row, book in zip(rows, books)
+        ]
+        return JsonResponse(paginator.get_paginated_data(data))
@@ -0,0 +1,140 @@
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from library_service.benchmark import format_ms
+
+ALIAS = "benchmark"
+PROFILES = {
+    "development": {"OPTIONS": {}, "CONN_MAX_AGE": 0},
+    "production": {"OPTIONS": settings.SQLITE_PRODUCTION_OPTIONS, "CONN_MAX_AGE": None},
+}
+SCHEMA = [
+    "CREATE TABLE book (id INTEGER PRIMARY KEY, title TEXT, inventory INTEGER)",
+    "CREATE TABLE borrowing (id INTEGER PRIMARY KEY, book_id INTEGER, user_id INTEGER)",
+    "CREATE INDEX borrowing_user_idx ON borrowing (user_id)",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare read/write throughput of the development and production SQLite "
+        "profiles with concurrent threads on a scratch database file"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=300, help="Per thread")
+        parser.add_argument("--write-ratio", type=float, default=0.2)
+        parser.add_argument("--books", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        for profile, profile_settings in PROFILES.items():
+            with tempfile.TemporaryDirectory() as directory:
+                connections.settings[ALIAS] = {
+                    **connections["default"].settings_dict,
+                    **profile_settings,
+                    "NAME": os.path.join(directory, "benchmark.sqlite3"),
+                }
+                try:
+                    self.seed(options["books"])
+                    result = self.run_threads(options)
+                finally:
+                    connections[ALIAS].close()
+                    del connections[ALIAS]
+                    del connections.settings[ALIAS]
+
+            latencies = sorted(result["latencies"])
+            self.stdout.write(
+                f"{profile:<12}"
+                f"  {result['requests'] / result['elapsed']:>8.0f} requests/s"
+                f"  p50 {format_ms(statistics.median(latencies)):>10}"
+                f"  p95 {format_ms(latencies[int(len(latencies) * 0.95)]):>10}"
+                f"  locked {result['locked']}"
+            )
+
+    def seed(self, books):
+        connection = connections[ALIAS]
+        with connection.cursor() as cursor:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+            cursor.executemany(
+                "INSERT INTO book (title, inventory) VALUES (%s, %s)",
+                [(f"Book {index}", 1000) for index in range(books)],
+            )
+
+    def run_threads(self, options):
+        result = {"requests": 0, "locked": 0, "latencies": []}
+        lock = threading.Lock()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            latencies, locked = [], 0
+            for _ in range(options["requests"]):
+                started = time.perf_counter()
+                try:
+                    if rng.random() < options["write_ratio"]:
+                        self.borrow(rng, options["books"])
+                    else:
+                        self.browse(rng, options["books"])
+                except OperationalError:
+                    locked += 1
+                # What Django does when a request finishes
+                connections[ALIAS].close_if_unusable_or_obsolete()
+                latencies.append(time.perf_counter() - started)
+            connections[ALIAS].close()
+            with lock:
+                result["requests"] += len(latencies)
+                result["locked"] += locked
+                result["latencies"] += latencies
+
+        threads = [
+            threading.Thread(target=worker, args=(seed,))
+            for seed in range(options["threads"])
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        result["elapsed"] = time.perf_counter() - started
+        return result
+
+    @staticmethod
+    def browse(rng, books):
+        first = rng.randint(1, max(books - 20, 1))
+        with connections[ALIAS].cursor() as cursor:
+            cursor.execute(
+                "SELECT id, title, inventory FROM book WHERE id BETWEEN %s AND %s",
+                [first, first + 19],
+            )
+            cursor.fetchall()
+            cursor.execute(
+                "SELECT COUNT(*) FROM borrowing WHERE user_id = %s",
+                [rng.randint(1, 100)],
+            )
+            cursor.fetchone()
+
+    @staticmethod
+    def borrow(rng, books):
+        book_id = rng.randint(1, books)
+        with transaction.atomic(using=ALIAS):
+            with connections[ALIAS].cursor() as cursor:
+                cursor.execute("SELECT inventory FROM book WHERE id = %s", [book_id])
+                cursor.fetchone()
+                cursor.execute(
+                    "UPDATE book SET inventory = inventory - 1 "
+                    "WHERE id = %s AND inventory > 0",
+                    [book_id],
+                )
+                cursor.execute(
+                    "INSERT INTO borrowing (book_id, user_id) VALUES (%s, %s)",
+                    [book_id, rng.randint(1, 100)],
+                )
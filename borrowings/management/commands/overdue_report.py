@@ -0,0 +1,51 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from borrowings.managers import OVERDUE_REPORT_FIELDS
+from borrowings.models import Borrowing
+from library_service.export import EXPORT_CHUNK_SIZE, csv_lines, ndjson_lines
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream overdue borrowings with their fines as CSV or NDJSON, "
+        "computed by the database"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+        parser.add_argument(
+            "--date",
+            help="Report borrowings overdue on this YYYY-MM-DD date, default today",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            today = date.fromisoformat(options["date"]) if options["date"] else None
+        except ValueError:
+            raise CommandError("--date must be a YYYY-MM-DD date")
+
+        columns = list(OVERDUE_REPORT_FIELDS)
+        totals = {"borrowings": 0, "fines": Decimal(0)}
+
+        def rows():
+            report = Borrowing.objects.overdue_report(today)
+            for row in report.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                totals["borrowings"] += 1
+                totals["fines"] += row["fine"]
+                yield {
+                    column: row[path] for column, path in OVERDUE_REPORT_FIELDS.items()
+                }
+
+        if options["format"] == "csv":
+            lines = csv_lines(rows(), columns)
+        else:
+            lines = ndjson_lines(rows())
+        for line in lines:
+            self.stdout.write(line, ending="")
+
+        self.stderr.write(
+            f"{totals['borrowings']} overdue borrowings, {totals['fines']} in fines"
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from borrowings.operations import recount_active_borrowings
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the active borrowing counters of users from their "
+        "borrowings which are not returned yet"
+    )
+
+    def handle(self, *args, **options):
+        fixed = recount_active_borrowings()
+        self.stdout.write(
+            self.style.SUCCESS(f"Fixed {fixed} active borrowing counters")
+        )
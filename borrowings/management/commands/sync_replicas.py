@@ -0,0 +1,32 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database into the DATABASE_REPLICAS files "
+        "with the online backup API, while both are in use"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=1024,
+            help="Pages copied per step, readers of the replica wait in between",
+        )
+
+    def handle(self, *args, **options):
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        for alias in settings.DATABASE_REPLICAS:
+            path = connections.settings[alias]["NAME"]
+            replica = sqlite3.connect(path)
+            try:
+                primary.connection.backup(replica, pages=options["pages"])
+            finally:
+                replica.close()
+            self.stdout.write(self.style.SUCCESS(f"Copied the primary to {path}"))
@@ -0,0 +1,75 @@
+from datetime import date
+
+from django.db import models
+from django.db.models import DecimalField, ExpressionWrapper, F, Func, Value
+
+# Overdue report column -> ORM path of its value
+OVERDUE_REPORT_FIELDS = {
+    "id": "id",
+    "user": "user_id",
+    "user_email": "user__email",
+    "book": "book_id",
+    "book_title": "book__title",
+    "borrow_date": "borrow_date",
+    "expected_return_date": "expected_return_date",
+    "days_overdue": "days_overdue",
+    "fine": "fine",
+}
+
+
+class DaysBetween(Func):
+    """Whole days from the second date to the first, computed by the database"""
+
+    function = "DATEDIFF"
+    arity = 2
+    output_field = models.IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template="CAST(julianday(%(expressions)s) AS INTEGER)",
+            arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template="(%(expressions)s)",
+            arg_joiner=" - ",
+            **extra_context,
+        )
+
+
+class BorrowingQuerySet(models.QuerySet):
+    def overdue(self, today=None):
+        """Borrowings not returned by their expected return date"""
+        return self.filter(
+            actual_return_date__isnull=True,
+            expected_return_date__lt=today or date.today(),
+        )
+
+    def with_fines(self, today=None):
+        """Annotate days_overdue and the fine accrued for them by today"""
+        days_overdue = DaysBetween(
+            Value(today or date.today(), output_field=models.DateField()),
+            F("expected_return_date"),
+        )
+        return self.annotate(
+            days_overdue=days_overdue,
+            fine=ExpressionWrapper(
+                F("days_overdue") * F("book__daily_fee"),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            ),
+        )
+
+    def overdue_report(self, today=None):
+        """Overdue borrowings with their fines as values() rows, oldest first"""
+        return (
+            self.overdue(today)
+            .with_fines(today)
+            .order_by("expected_return_date", "id")
+            .values(*OVERDUE_REPORT_FIELDS.values())
+        )
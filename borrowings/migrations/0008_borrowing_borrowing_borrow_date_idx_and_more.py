@@ -0,0 +1,24 @@
+# Generated by Django 4.2.4 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("borrowings", "0007_alter_borrowing_actual_return_date"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                fields=["borrow_date"], name="borrowing_borrow_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                fields=["expected_return_date"], name="borrowing_expected_return_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.4 on 2026-10-18 16:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("borrowings", "0008_borrowing_borrowing_borrow_date_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date__isnull", True)),
+                fields=["expected_return_date"],
+                name="borrowing_overdue_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.4 on 2026-10-18 17:04
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("borrowings", "0009_borrowing_borrowing_overdue_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="borrowing",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="borrowing",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                fields=["user", "actual_return_date"], name="borrowing_user_return_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date__isnull", True)),
+                fields=["user", "actual_return_date"],
+                name="borrowing_active_user_idx",
+            ),
+        ),
+    ]
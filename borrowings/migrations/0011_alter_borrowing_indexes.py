@@ -0,0 +1,28 @@
+# Generated by Django 4.2.4 on 2026-10-18 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("borrowings", "0010_alter_borrowing_user_and_more"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="borrowing",
+            name="borrowing_overdue_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="borrowing",
+            name="borrowing_active_user_idx",
+        ),
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date__isnull", True)),
+                fields=["actual_return_date", "expected_return_date"],
+                name="borrowing_overdue_idx",
+            ),
+        ),
+    ]
@@ -2,6 +2,7 @@ from django.core.exceptions import ValidationError
 from django.db import models
 
 from books.models import Book
+from borrowings.managers import BorrowingQuerySet
 from users.models import User
 
 
@@ -24,9 +25,35 @@ class Borrowing(models.Model):
         related_name="borrowing",
         validators=[validate_book_inventory],
     )
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="borrowing")
+    # Indexed by borrowing_user_return_idx, which starts with user
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="borrowing", db_index=False
+    )
+
+    objects = BorrowingQuerySet.as_manager()
 
     class Meta:
+        indexes = [
+            models.Index(fields=["borrow_date"], name="borrowing_borrow_date_idx"),
+            models.Index(
+                fields=["expected_return_date"],
+                name="borrowing_expected_return_idx",
+            ),
+            # Borrowings of users, optionally only the ones not returned yet
+            models.Index(
+                fields=["user", "actual_return_date"],
+                name="borrowing_user_return_idx",
+            ),
+            # Partial index of active borrowings for overdue scans and
+            # is_active lists of all users. actual_return_date leads, so that
+            # SQLite searches it for "actual_return_date IS NULL" and can
+            # count the active borrowings from the index alone.
+            models.Index(
+                fields=["actual_return_date", "expected_return_date"],
+                name="borrowing_overdue_idx",
+                condition=models.Q(actual_return_date__isnull=True),
+            ),
+        ]
         constraints = [
             models.CheckConstraint(
                 name="expected_return_date > borrow_date",
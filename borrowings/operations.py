@@ -0,0 +1,350 @@
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections, router, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.signals import books_borrowed, books_returned
+
+NO_COPIES_LEFT = "There are no available samples of the book which you try to borrow"
+ALREADY_RETURNED = "The book has already been returned"
+RETURN_BEFORE_BORROW = "Actual return date must be at least a day after the borrow date"
+BORROWING_LIMIT_REACHED = "You may not have more than {limit} books borrowed at once"
+
+# Outcomes of return_borrowings() per borrowing id
+OUTCOME_RETURNED = "returned"
+OUTCOME_ALREADY_RETURNED = "already_returned"
+OUTCOME_NOT_FOUND = "not_found"
+OUTCOME_RETURN_BEFORE_BORROW = "return_date_not_after_borrow_date"
+
+
+class BooksUnavailable(APIException):
+    """A checkout which could not reserve every requested copy"""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some of the requested books are not available"
+    default_code = "unavailable"
+
+    def __init__(self, unavailable):
+        super(BooksUnavailable, self).__init__()
+        self.detail = {"detail": self.detail, "unavailable": unavailable}
+
+
+def book_not_found(book_id):
+    return f'Invalid pk "{book_id}" - object does not exist.'
+
+
+def group_by_count(ids):
+    """Group ids by how many times they occur, as {count: [ids]}"""
+    groups = defaultdict(list)
+    for pk, count in Counter(ids).items():
+        groups[count].append(pk)
+    return groups
+
+
+def count_active_borrowings(user, count):
+    """
+    Add count borrowings to the active borrowings of a user with one
+    conditional UPDATE, which fails when it would exceed BORROWING_LIMIT.
+    """
+    limit = settings.BORROWING_LIMIT
+    counted = (
+        get_user_model()
+        .objects.filter(id=user.id, active_borrowings__lte=limit - count)
+        .update(active_borrowings=F("active_borrowings") + count)
+    )
+    if not counted:
+        raise ValidationError(BORROWING_LIMIT_REACHED.format(limit=limit))
+
+
+def uncount_active_borrowings(user_ids):
+    """
+    Subtract returned borrowings from the counters of their users. Counters
+    which drifted stop at 0, recount_active_borrowings() corrects them.
+    """
+    for count, grouped_ids in group_by_count(user_ids).items():
+        get_user_model().objects.filter(id__in=grouped_ids).update(
+            active_borrowings=Greatest(F("active_borrowings") - count, 0)
+        )
+
+
+def recount_active_borrowings():
+    """
+    Recompute the active borrowing counters of all users with one UPDATE
+    and a correlated COUNT of their borrowings which are not returned,
+    answered from the borrowing_user_return_idx index. Returns the
+    number of counters which were wrong.
+    """
+    active = (
+        Borrowing.objects.filter(user=OuterRef("pk"), actual_return_date__isnull=True)
+        .order_by()
+        .values("user")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    actual = Coalesce(Subquery(active), Value(0))
+    return (
+        get_user_model()
+        .objects.exclude(active_borrowings=actual)
+        .update(active_borrowings=actual)
+    )
+
+
+@transaction.atomic
+def borrow_book(user, book_id, expected_return_date):
+    """
+    Reserve a copy with one conditional UPDATE and insert the borrowing in
+    the same transaction, so concurrent borrows can't take more copies than
+    the inventory has. The book is only read again when no copy was left.
+    """
+    count_active_borrowings(user, 1)
+    reserved = Book.objects.filter(id=book_id, inventory__gt=0).update(
+        inventory=F("inventory") - 1
+    )
+    if not reserved:
+        if Book.objects.filter(id=book_id).exists():
+            raise ValidationError({"book": [NO_COPIES_LEFT]})
+        raise ValidationError({"book": [book_not_found(book_id)]})
+
+    borrowing = Borrowing(
+        user=user, book_id=book_id, expected_return_date=expected_return_date
+    )
+    # The copy is taken, decrease_inventory_when_borrowing_created must skip it
+    borrowing._inventory_reserved = True
+    borrowing.save(force_insert=True)
+
+    books_borrowed.send(sender=Borrowing, borrowings=[borrowing])
+    return borrowing
+
+
+def can_update_returning(connection):
+    """UPDATE ... RETURNING is available on PostgreSQL and SQLite 3.35+"""
+    return (
+        connection.vendor in ("postgresql", "sqlite")
+        and connection.features.can_return_columns_from_insert
+    )
+
+
+def mark_returned(borrowing_ids, actual_return_date):
+    """
+    Set the return date of the borrowings which are not returned yet and
+    were borrowed before that date, with one conditional UPDATE. Returns
+    {id: (user_id, book_id, borrow_date)} of the borrowings it updated.
+    """
+    connection = connections[router.db_for_write(Borrowing)]
+    if can_update_returning(connection):
+        quote_name = connection.ops.quote_name
+        date_value = connection.ops.adapt_datefield_value(actual_return_date)
+        borrow_date = Borrowing._meta.get_field("borrow_date")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {quote_name(Borrowing._meta.db_table)} "
+                f"SET {quote_name('actual_return_date')} = %s "
+                f"WHERE {quote_name('id')} IN "
+                f"({', '.join(['%s'] * len(borrowing_ids))}) "
+                f"AND {quote_name('actual_return_date')} IS NULL "
+                f"AND {quote_name('borrow_date')} < %s "
+                f"RETURNING {quote_name('id')}, {quote_name('user_id')}, "
+                f"{quote_name('book_id')}, {quote_name('borrow_date')}",
+                [date_value, *borrowing_ids, date_value],
+            )
+            return {
+                pk: (user_id, book_id, borrow_date.to_python(borrowed))
+                for pk, user_id, book_id, borrowed in cursor.fetchall()
+            }
+
+    borrowings = Borrowing.objects.filter(
+        id__in=borrowing_ids,
+        actual_return_date__isnull=True,
+        borrow_date__lt=actual_return_date,
+    )
+    rows = {
+        pk: (user_id, book_id, borrow_date)
+        for pk, user_id, book_id, borrow_date in borrowings.select_for_update().values_list(
+            "id", "user_id", "book_id", "borrow_date"
+        )
+    }
+    if rows:
+        borrowings.filter(id__in=rows).update(actual_return_date=actual_return_date)
+    return rows
+
+
+def give_back_copies(book_ids):
+    """
+    Put the copies of book_ids, which repeat once per returned copy, back
+    with one F() increment per group of books returned the same number of
+    times. Returns {book_id: daily_fee} for the fees of the returns, taken
+    from the increments with UPDATE ... RETURNING where it is available.
+    """
+    groups = group_by_count(book_ids)
+    connection = connections[router.db_for_write(Book)]
+    if not can_update_returning(connection):
+        for count, grouped_ids in groups.items():
+            Book.objects.filter(id__in=grouped_ids).update(
+                inventory=F("inventory") + count
+            )
+        return dict(
+            Book.objects.filter(id__in=set(book_ids)).values_list("id", "daily_fee")
+        )
+
+    quote_name = connection.ops.quote_name
+    daily_fee = Book._meta.get_field("daily_fee")
+    daily_fees = {}
+    with connection.cursor() as cursor:
+        for count, grouped_ids in groups.items():
+            cursor.execute(
+                f"UPDATE {quote_name(Book._meta.db_table)} "
+                f"SET {quote_name('inventory')} = {quote_name('inventory')} + %s "
+                f"WHERE {quote_name('id')} IN "
+                f"({', '.join(['%s'] * len(grouped_ids))}) "
+                f"RETURNING {quote_name('id')}, {quote_name(daily_fee.column)}",
+                [count, *grouped_ids],
+            )
+            for book_id, fee in cursor.fetchall():
+                daily_fees[book_id] = daily_fee.to_python(fee)
+    return daily_fees
+
+
+@transaction.atomic
+def return_borrowing(borrowing_id, actual_return_date):
+    """
+    Mark a borrowing returned with one conditional UPDATE and give its copy
+    back with an F() increment in the same transaction. The borrowing is
+    only read when it could not be returned, to report why.
+    """
+    returned = mark_returned([borrowing_id], actual_return_date)
+    if not returned:
+        borrowing = (
+            Borrowing.objects.filter(id=borrowing_id)
+            .values("actual_return_date")
+            .first()
+        )
+        if borrowing is None:
+            raise NotFound()
+        # Shaped like the serializer validate() errors the endpoint used to return
+        if borrowing["actual_return_date"] is not None:
+            raise ValidationError({"non_field_errors": [ALREADY_RETURNED]})
+        raise ValidationError({"non_field_errors": [RETURN_BEFORE_BORROW]})
+
+    [(user_id, book_id, borrow_date)] = returned.values()
+    daily_fees = give_back_copies([book_id])
+    uncount_active_borrowings([user_id])
+
+    borrowing = Borrowing(
+        id=borrowing_id,
+        user_id=user_id,
+        book_id=book_id,
+        borrow_date=borrow_date,
+        actual_return_date=actual_return_date,
+    )
+    books_returned.send(sender=Borrowing, borrowings=[borrowing], daily_fees=daily_fees)
+    return borrowing
+
+
+@transaction.atomic
+def return_borrowings(ids, actual_return_date):
+    """
+    Return many borrowings at once: mark the returnable ones with one
+    conditional UPDATE and give their copies back with one F() increment
+    per group of books returned the same number of times. Only the
+    borrowings which could not be returned are read, to report why.
+    Returns {id: outcome}.
+    """
+    returned = mark_returned(list(dict.fromkeys(ids)), actual_return_date)
+    outcomes = {
+        pk: OUTCOME_RETURNED if pk in returned else OUTCOME_NOT_FOUND for pk in ids
+    }
+    failed = [pk for pk in outcomes if pk not in returned]
+    if failed:
+        rows = Borrowing.objects.filter(id__in=failed).values_list(
+            "id", "actual_return_date"
+        )
+        for pk, returned_date in rows:
+            outcomes[pk] = (
+                OUTCOME_ALREADY_RETURNED
+                if returned_date is not None
+                else OUTCOME_RETURN_BEFORE_BORROW
+            )
+
+    if returned:
+        daily_fees = give_back_copies([book_id for _, book_id, _ in returned.values()])
+        uncount_active_borrowings([user_id for user_id, _, _ in returned.values()])
+        books_returned.send(
+            sender=Borrowing,
+            borrowings=[
+                Borrowing(
+                    id=pk,
+                    user_id=user_id,
+                    book_id=book_id,
+                    borrow_date=borrow_date,
+                    actual_return_date=actual_return_date,
+                )
+                for pk, (user_id, book_id, borrow_date) in returned.items()
+            ],
+            daily_fees=daily_fees,
+        )
+
+    return outcomes
+
+
+def find_unavailable(counts):
+    """Books which have fewer copies than requested, unknown ids included"""
+    books = {
+        book_id: (title, inventory)
+        for book_id, title, inventory in Book.objects.filter(id__in=counts).values_list(
+            "id", "title", "inventory"
+        )
+    }
+    unavailable = []
+    for book_id, count in counts.items():
+        title, inventory = books.get(book_id, (None, 0))
+        if inventory < count:
+            unavailable.append(
+                {
+                    "id": book_id,
+                    "title": title,
+                    "requested": count,
+                    "available": inventory,
+                }
+            )
+    return unavailable
+
+
+def checkout_books(user, book_ids, expected_return_date):
+    """
+    Borrow several books at once. Copies are reserved with one conditional
+    UPDATE per group of books requested the same number of times and the
+    borrowings are inserted with bulk_create, all in one transaction.
+    Nothing is borrowed when a book is short of copies; BooksUnavailable
+    then lists those books.
+    """
+    try:
+        with transaction.atomic():
+            count_active_borrowings(user, len(book_ids))
+            for count, ids in group_by_count(book_ids).items():
+                reserved = Book.objects.filter(id__in=ids, inventory__gte=count).update(
+                    inventory=F("inventory") - count
+                )
+                if reserved != len(ids):
+                    # Roll back the copies reserved so far
+                    raise BooksUnavailable([])
+
+            borrowings = Borrowing.objects.bulk_create(
+                Borrowing(
+                    user=user,
+                    book_id=book_id,
+                    expected_return_date=expected_return_date,
+                )
+                for book_id in book_ids
+            )
+            books_borrowed.send(sender=Borrowing, borrowings=borrowings)
+    except BooksUnavailable:
+        raise BooksUnavailable(find_unavailable(Counter(book_ids))) from None
+
+    return borrowings
@@ -2,9 +2,12 @@ from datetime import date
 
 from rest_framework import serializers
 
-from books.models import Book
 from books.serializers import BookListRetrieveSerializer
-from borrowings.models import Borrowing, validate_book_inventory
+from borrowings.models import Borrowing
+from borrowings.operations import borrow_book
+
+BULK_RETURN_MAX_IDS = 1000
+CHECKOUT_MAX_BOOKS = 20
 
 
 class BorrowingListRetrieveSerializer(serializers.ModelSerializer):
@@ -23,9 +26,8 @@ class BorrowingListRetrieveSerializer(serializers.ModelSerializer):
 
 
 class BorrowingCreateSerializer(serializers.ModelSerializer):
-    book = serializers.PrimaryKeyRelatedField(
-        queryset=Book.objects.all(), validators=[validate_book_inventory]
-    )
+    # A plain id, the book is checked by the conditional inventory update
+    book = serializers.IntegerField(source="book_id", min_value=1)
 
     class Meta:
         model = Borrowing
@@ -44,9 +46,29 @@ class BorrowingCreateSerializer(serializers.ModelSerializer):
             )
         return value
 
+    def create(self, validated_data):
+        return borrow_book(
+            validated_data["user"],
+            validated_data["book_id"],
+            validated_data["expected_return_date"],
+        )
+
+
+class BorrowingCheckoutSerializer(serializers.Serializer):
+    books = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=CHECKOUT_MAX_BOOKS,
+    )
+    expected_return_date = serializers.DateField()
+
+    def validate_expected_return_date(self, value):
+        return BorrowingCreateSerializer.validate_expected_return_date(value)
+
 
 class BorrowingReturnSerializer(serializers.ModelSerializer):
-    actual_return_date = serializers.DateField(initial=date.today)
+    # The date is checked against the borrow date by return_borrowing()
+    actual_return_date = serializers.DateField(default=date.today)
 
     class Meta:
         model = Borrowing
@@ -54,9 +76,25 @@ class BorrowingReturnSerializer(serializers.ModelSerializer):
             "actual_return_date",
         ]
 
-    def validate(self, attrs):
-        if attrs["actual_return_date"] <= self.context.get("borrow_date"):
-            raise serializers.ValidationError(
-                "Actual return date must be at least a day after the borrow date"
-            )
-        return attrs
+
+class BorrowingBulkReturnSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_RETURN_MAX_IDS,
+    )
+    actual_return_date = serializers.DateField(default=date.today)
+
+
+class BorrowingOverdueSerializer(serializers.Serializer):
+    """Rows of Borrowing.objects.overdue_report()"""
+
+    id = serializers.IntegerField()
+    user = serializers.IntegerField(source="user_id")
+    user_email = serializers.EmailField(source="user__email")
+    book = serializers.IntegerField(source="book_id")
+    book_title = serializers.CharField(source="book__title")
+    borrow_date = serializers.DateField()
+    expected_return_date = serializers.DateField()
+    days_overdue = serializers.IntegerField()
+    fine = serializers.DecimalField(max_digits=12, decimal_places=2)
@@ -0,0 +1,27 @@
+from django.db.models.signals import pre_save
+from django.dispatch import Signal, receiver
+
+from borrowings.models import Borrowing
+
+# Sent with ``borrowings``, a list of Borrowing instances with at least id,
+# user_id, book_id, borrow_date and, for returns, actual_return_date, by the
+# borrowing operations which change book inventory with UPDATE statements
+# instead of Book.save(), inside their transaction. books_returned also has
+# ``daily_fees``, the {book_id: daily_fee} of the returned books
+books_borrowed = Signal()
+books_returned = Signal()
+
+
+@receiver(pre_save, sender=Borrowing)
+def remember_return_when_borrowing_saved(sender, instance, **kwargs):
+    """
+    Set ``_returned`` of a borrowing which is saved through the ORM with the
+    return date it did not have, for the post_save receivers of other apps
+    """
+    instance._returned = bool(
+        instance.pk
+        and instance.actual_return_date
+        and Borrowing.objects.filter(
+            pk=instance.pk, actual_return_date__isnull=True
+        ).exists()
+    )
@@ -0,0 +1,121 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+BORROWING_URL = reverse("borrowings:borrowing-list")
+CHECKOUT_URL = reverse("borrowings:borrowing-checkout")
+BULK_RETURN_URL = reverse("borrowings:borrowing-bulk-return")
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+@override_settings(BORROWING_LIMIT=2)
+class ActiveBorrowingLimitTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@admin.com", password="qwer1234", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.book = Book.objects.create(
+            title="Sample", cover="Hard", inventory=10, daily_fee=1
+        )
+
+    def borrow(self):
+        return self.client.post(
+            BORROWING_URL, {"book": self.book.id, "expected_return_date": TOMORROW}
+        )
+
+    def active_borrowings(self):
+        self.user.refresh_from_db()
+        return self.user.active_borrowings
+
+    def test_borrowing_limit(self):
+        ids = [self.borrow().data["id"], self.borrow().data["id"]]
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.borrow()
+        self.book.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(
+            any(
+                "borrowings_borrowing" in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+        self.assertEqual(self.active_borrowings(), 2)
+        self.assertEqual(self.book.inventory, 8)
+
+        self.client.patch(
+            reverse("borrowings:borrowing-return-borrowing", args=[ids[0]]),
+            {"actual_return_date": TOMORROW},
+        )
+
+        self.assertEqual(self.active_borrowings(), 1)
+        self.assertEqual(self.borrow().status_code, status.HTTP_201_CREATED)
+
+    def test_checkout_counts_every_book(self):
+        response = self.client.post(
+            CHECKOUT_URL,
+            {"books": [self.book.id] * 3, "expected_return_date": TOMORROW},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.active_borrowings(), 0)
+        self.assertFalse(Borrowing.objects.exists())
+
+    def test_bulk_return_uncounts_borrowings(self):
+        ids = [self.borrow().data["id"], self.borrow().data["id"]]
+
+        self.client.post(
+            BULK_RETURN_URL,
+            {"ids": ids, "actual_return_date": TOMORROW},
+            format="json",
+        )
+
+        self.assertEqual(self.active_borrowings(), 0)
+
+    def test_return_saved_through_orm_is_checked_once(self):
+        borrowing = Borrowing.objects.create(
+            user=self.user, book=self.book, expected_return_date=TOMORROW
+        )
+        # A drifted counter stops at 0 instead of failing the return
+        get_user_model().objects.update(active_borrowings=0)
+        borrowing.actual_return_date = TOMORROW
+
+        with CaptureQueriesContext(connection) as context:
+            borrowing.save()
+
+        return_checks = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith('SELECT 1 AS "a" FROM "borrowings_borrowing"')
+        ]
+        self.assertEqual(len(return_checks), 1)
+        self.assertEqual(self.active_borrowings(), 0)
+
+    def test_recount_active_borrowings(self):
+        self.borrow()
+        Borrowing.objects.create(
+            user=self.user, book=self.book, expected_return_date=TOMORROW
+        )
+        get_user_model().objects.update(active_borrowings=5)
+        out = StringIO()
+
+        call_command("recount_active_borrowings", stdout=out)
+
+        self.assertEqual(self.active_borrowings(), 2)
+        self.assertIn("Fixed 1 active borrowing counters", out.getvalue())
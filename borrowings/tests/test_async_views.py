@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books.models import Author, Book
+from borrowings.models import Borrowing
+
+BORROWING_URL = reverse("borrowings:borrowing-list")
+ASYNC_URLCONF = "library_service.async_urls"
+
+
+class AsyncBorrowingListViewTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="qwer1234"
+        )
+        self.admin = get_user_model().objects.create_user(
+            email="admin@admin.com", password="qwer1234", is_staff=True
+        )
+        book = Book.objects.create(
+            title="Sample", cover="Hard", inventory=10, daily_fee=1
+        )
+        book.authors.set([Author.objects.create(first_name="Ivan", last_name="Franko")])
+        for user in (self.user, self.user, self.admin):
+            Borrowing.objects.create(
+                user=user,
+                book=book,
+                expected_return_date=date.today() + timedelta(days=2),
+            )
+        Borrowing.objects.filter(id=1).update(actual_return_date=date.today())
+
+    def assert_same_responses(self, user, params=None):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        response = self.client.get(BORROWING_URL, params)
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            async_response = self.client.get(BORROWING_URL, params)
+
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.json(), response.json())
+
+    def test_list_own_borrowings(self):
+        self.assert_same_responses(self.user)
+        self.assert_same_responses(self.user, {"is_active": "true"})
+
+    def test_list_borrowings_of_users(self):
+        self.assert_same_responses(self.admin)
+        self.assert_same_responses(self.admin, {"users": str(self.admin.id)})
+
+    def test_list_requires_authentication(self):
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            response = self.client.get(BORROWING_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -1,7 +1,10 @@
 from datetime import date, timedelta, datetime
+from unittest import mock, skipUnless
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -9,9 +12,14 @@ from rest_framework.test import APIClient
 from books.models import Book, Author
 from books.serializers import BookListRetrieveSerializer
 from borrowings.models import Borrowing
+from borrowings import operations
+from borrowings.operations import can_update_returning
 from borrowings.serializers import BorrowingListRetrieveSerializer
+from library_service.pagination import KeysetPagination
 
 BORROWING_URL = reverse("borrowings:borrowing-list")
+BULK_RETURN_URL = reverse("borrowings:borrowing-bulk-return")
+CHECKOUT_URL = reverse("borrowings:borrowing-checkout")
 
 
 def create_sample_author(**params):
@@ -48,6 +56,10 @@ def borrowing_return_url(pk: int):
     return reverse("borrowings:borrowing-return-borrowing", args=[pk])
 
 
+def export_url(export_format: str):
+    return reverse("borrowings:borrowing-export", args=[export_format])
+
+
 class AuthenticatedBorrowingApiTest(TestCase):
     def setUp(self) -> None:
         self.client = APIClient()
@@ -72,6 +84,39 @@ class AuthenticatedBorrowingApiTest(TestCase):
         self.assertEqual(response.data["count"], 2)
         self.assertEqual(response.data["results"], serializer.data)
 
+    def test_list_borrowings_with_sparse_fields(self):
+        borrowing = create_sample_borrowing(user=self.user)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(BORROWING_URL, {"fields": "id,book"})
+        nested, queries = response.data["results"], len(context.captured_queries)
+        response = self.client.get(BORROWING_URL, {"fields": "id,book", "expand": ""})
+
+        self.assertEqual(
+            nested,
+            [
+                {
+                    "id": borrowing.id,
+                    "book": BookListRetrieveSerializer(borrowing.book).data,
+                }
+            ],
+        )
+        self.assertEqual(
+            response.data["results"], [{"id": borrowing.id, "book": borrowing.book_id}]
+        )
+        # count, page rows joined with books and authors of the page books
+        self.assertEqual(queries, 3)
+
+    def test_sparse_fields_skip_book_join_unless_expanded(self):
+        create_sample_borrowing(user=self.user)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(BORROWING_URL, {"fields": "id,book", "expand": ""})
+
+        self.assertFalse(
+            any("books_book" in query["sql"] for query in context.captured_queries)
+        )
+
     def test_forbidden_retrieve_borrowing_of_another_user(self):
         create_sample_borrowing(user=self.user)
         another_user = get_user_model().objects.create_user(
@@ -119,6 +164,95 @@ class AuthenticatedBorrowingApiTest(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_create_borrowing_reserves_copy_with_one_update(self):
+        book = create_sample_book(inventory=1)
+        payload = {
+            "expected_return_date": date.today() + timedelta(days=2),
+            "book": book.id,
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(BORROWING_URL, data=payload)
+        book_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if '"books_book"' in query["sql"]
+        ]
+        second_response = self.client.post(BORROWING_URL, data=payload)
+        book.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["book"], book.id)
+        self.assertEqual(len(book_queries), 1)
+        self.assertTrue(book_queries[0].startswith('UPDATE "books_book"'))
+        self.assertEqual(second_response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(book.inventory, 0)
+        self.assertEqual(Borrowing.objects.count(), 1)
+
+    def test_create_borrowing_of_unknown_book(self):
+        payload = {
+            "expected_return_date": date.today() + timedelta(days=2),
+            "book": 999,
+        }
+
+        response = self.client.post(BORROWING_URL, data=payload)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("book", response.data)
+
+    def test_checkout_many_books(self):
+        books = [create_sample_book(inventory=2) for _ in range(3)]
+        book_ids = [books[0].id, books[1].id, books[2].id, books[2].id]
+        payload = {
+            "books": book_ids,
+            "expected_return_date": date.today() + timedelta(days=7),
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(CHECKOUT_URL, payload, format="json")
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if "borrowings_borrowing" in query["sql"] or '"books_book"' in query["sql"]
+        ]
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([borrowing["book"] for borrowing in response.data], book_ids)
+        self.assertEqual(
+            list(Book.objects.order_by("id").values_list("inventory", flat=True)),
+            [1, 1, 0],
+        )
+        self.assertEqual(Borrowing.objects.filter(user=self.user).count(), 4)
+        # one reservation per requested count (1 and 2) and one insert
+        self.assertEqual(len(queries), 3)
+
+    def test_checkout_is_all_or_nothing(self):
+        available = create_sample_book(inventory=1)
+        sold_out = create_sample_book(title="Sold out", inventory=0)
+        payload = {
+            "books": [available.id, sold_out.id, 999],
+            "expected_return_date": date.today() + timedelta(days=7),
+        }
+
+        response = self.client.post(CHECKOUT_URL, payload, format="json")
+        available.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.data["unavailable"],
+            [
+                {
+                    "id": sold_out.id,
+                    "title": "Sold out",
+                    "requested": 1,
+                    "available": 0,
+                },
+                {"id": 999, "title": None, "requested": 1, "available": 0},
+            ],
+        )
+        self.assertEqual(available.inventory, 1)
+        self.assertFalse(Borrowing.objects.exists())
+
     def test_raises_error_if_expected_return_date_not_after_borrow_date(self):
         book = create_sample_book()
         payload = {
@@ -133,6 +267,16 @@ class AuthenticatedBorrowingApiTest(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_export_access_denied(self):
+        response = self.client.get(export_url("ndjson"))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_return_access_denied(self):
+        response = self.client.post(BULK_RETURN_URL, {"ids": [1]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
     def test_update_borrowing_unavailable(self):
         borrowing = create_sample_borrowing(user=self.user)
         payload = {
@@ -150,6 +294,15 @@ class AuthenticatedBorrowingApiTest(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
 
+    def test_invalid_date_cursor(self):
+        cursor = KeysetPagination.encode_cursor(["notadate", 1])
+
+        response = self.client.get(
+            BORROWING_URL, {"ordering": "borrow_date", "cursor": cursor}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
 
 class AdminBorrowingApiTest(TestCase):
     def setUp(self) -> None:
@@ -213,3 +366,186 @@ class AdminBorrowingApiTest(TestCase):
         )
 
         self.assertEqual(response2.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response2.data, {"non_field_errors": ["The book has already been returned"]}
+        )
+
+    @skipUnless(can_update_returning(connection), "UPDATE ... RETURNING is needed")
+    def test_return_borrowing_with_one_conditional_update(self):
+        borrowing = create_sample_borrowing(user=self.user)
+        inventory = Book.objects.get(id=borrowing.book_id).inventory
+
+        return_date = date.today() + timedelta(days=1)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(
+                borrowing_return_url(pk=borrowing.id),
+                data={"actual_return_date": return_date},
+            )
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if "borrowings_borrowing" in query["sql"] or '"books_book"' in query["sql"]
+        ]
+        borrowing.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"actual_return_date": str(return_date)})
+        self.assertEqual(borrowing.actual_return_date, return_date)
+        self.assertEqual(borrowing.book.inventory, inventory + 1)
+        self.assertEqual(len(queries), 2)
+        self.assertTrue(all(query.startswith("UPDATE") for query in queries))
+
+    def test_return_unknown_borrowing(self):
+        response = self.client.patch(borrowing_return_url(pk=999))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_return_date_must_be_after_borrow_date(self):
+        borrowing = create_sample_borrowing(user=self.user)
+        inventory = Book.objects.get(id=borrowing.book_id).inventory
+
+        response = self.client.patch(
+            borrowing_return_url(pk=borrowing.id),
+            data={"actual_return_date": date.today() - timedelta(days=1)},
+        )
+        borrowing.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data,
+            {
+                "non_field_errors": [
+                    "Actual return date must be at least a day after the borrow date"
+                ]
+            },
+        )
+        self.assertIsNone(borrowing.actual_return_date)
+        self.assertEqual(borrowing.book.inventory, inventory)
+
+    def test_bulk_return_borrowings(self):
+        book = create_sample_book(inventory=5)
+        borrowings = [
+            create_sample_borrowing(user=self.user, book=book) for _ in range(3)
+        ]
+        other = create_sample_borrowing(user=self.user)
+        returned = create_sample_borrowing(
+            user=self.user, actual_return_date=date.today()
+        )
+        ids = [borrowing.id for borrowing in borrowings] + [other.id, returned.id]
+        return_date = date.today() + timedelta(days=1)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                BULK_RETURN_URL,
+                {"ids": ids + [999], "actual_return_date": return_date},
+                format="json",
+            )
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if "borrowings_borrowing" in query["sql"] or '"books_book"' in query["sql"]
+        ]
+        book.refresh_from_db()
+        other.book.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {
+                **{str(borrowing.id): "returned" for borrowing in borrowings},
+                str(other.id): "returned",
+                str(returned.id): "already_returned",
+                "999": "not_found",
+            },
+        )
+        self.assertEqual(book.inventory, 5)
+        self.assertEqual(other.book.inventory, 3)
+        self.assertEqual(
+            Borrowing.objects.filter(actual_return_date=return_date).count(), 4
+        )
+        # mark returned, one increment per returned count (3 and 1), read the
+        # borrowings which were not returned
+        self.assertEqual(len(queries), 4)
+
+    def test_bulk_return_of_borrowing_returned_concurrently(self):
+        borrowing = create_sample_borrowing(user=self.user)
+        inventory = Book.objects.get(id=borrowing.book_id).inventory
+        return_date = date.today() + timedelta(days=1)
+        mark_returned = operations.mark_returned
+
+        def mark_returned_after_other_return(ids, actual_return_date):
+            if not calls:
+                calls.append(ids)
+                operations.return_borrowing(borrowing.id, actual_return_date)
+            return mark_returned(ids, actual_return_date)
+
+        calls = []
+        with mock.patch.object(
+            operations, "mark_returned", mark_returned_after_other_return
+        ):
+            response = self.client.post(
+                BULK_RETURN_URL,
+                {"ids": [borrowing.id], "actual_return_date": return_date},
+                format="json",
+            )
+        self.user.refresh_from_db()
+
+        self.assertEqual(response.json(), {str(borrowing.id): "already_returned"})
+        self.assertEqual(
+            Book.objects.get(id=borrowing.book_id).inventory, inventory + 1
+        )
+        self.assertEqual(self.user.active_borrowings, 0)
+
+    def test_bulk_return_rejects_date_before_borrow_date(self):
+        borrowing = create_sample_borrowing(user=self.user)
+
+        response = self.client.post(
+            BULK_RETURN_URL,
+            {"ids": [borrowing.id], "actual_return_date": date.today()},
+            format="json",
+        )
+
+        self.assertEqual(
+            response.json(), {str(borrowing.id): "return_date_not_after_borrow_date"}
+        )
+
+    def test_list_borrowings_with_keyset_pagination(self):
+        borrowings = [create_sample_borrowing(user=self.user) for _ in range(3)]
+
+        response = self.client.get(
+            BORROWING_URL,
+            {"pagination": "keyset", "ordering": "-borrow_date", "page_size": 2},
+        )
+        next_response = self.client.get(response.data["next"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [borrowing["id"] for borrowing in response.data["results"]],
+            [borrowings[2].id, borrowings[1].id],
+        )
+        self.assertEqual(
+            [borrowing["id"] for borrowing in next_response.data["results"]],
+            [borrowings[0].id],
+        )
+        self.assertIsNone(next_response.data["next"])
+
+    def test_export_borrowing_history_as_csv(self):
+        borrowing = create_sample_borrowing(user=self.user)
+        create_sample_borrowing(user=self.user)
+
+        response = self.client.get(export_url("csv"))
+        lines = b"".join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            lines[0],
+            "id,borrow_date,expected_return_date,actual_return_date,"
+            "book,book_title,user,user_email",
+        )
+        self.assertEqual(
+            lines[1],
+            f"{borrowing.id},{borrowing.borrow_date},{borrowing.expected_return_date},"
+            f",{borrowing.book_id},Sample,{self.user.id},{self.user.email}",
+        )
+        self.assertEqual(len(lines), 3)
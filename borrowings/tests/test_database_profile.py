@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+
+ALIAS = "profile_test"
+
+
+class ProductionDatabaseProfileTest(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        connections.settings[ALIAS] = {
+            **connections["default"].settings_dict,
+            "NAME": os.path.join(directory.name, "profile.sqlite3"),
+            "OPTIONS": settings.SQLITE_PRODUCTION_OPTIONS,
+        }
+        self.addCleanup(connections.settings.pop, ALIAS)
+        self.addCleanup(connections.__delitem__, ALIAS)
+        self.addCleanup(lambda: connections[ALIAS].close())
+
+    def test_pragmas_applied_on_connect(self):
+        with connections[ALIAS].cursor() as cursor:
+            pragmas = {}
+            for name in ("journal_mode", "busy_timeout", "synchronous"):
+                cursor.execute(f"PRAGMA {name}")
+                pragmas[name] = cursor.fetchone()[0]
+
+        self.assertEqual(
+            pragmas, {"journal_mode": "wal", "busy_timeout": 5000, "synchronous": 1}
+        )
+
+    def test_transactions_begin_immediate(self):
+        with CaptureQueriesContext(connections[ALIAS]) as context:
+            with transaction.atomic(using=ALIAS):
+                connections[ALIAS].cursor().execute("SELECT 1")
+
+        self.assertEqual(context.captured_queries[0]["sql"], "BEGIN IMMEDIATE")
@@ -0,0 +1,108 @@
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+OVERDUE_URL = reverse("borrowings:borrowing-overdue")
+
+
+def create_borrowing(user, book, borrowed_days_ago, expected_days_ago):
+    """A borrowing backdated past the auto_now_add borrow date"""
+    borrowing = Borrowing.objects.create(
+        user=user, book=book, expected_return_date=date.today() + timedelta(days=1)
+    )
+    Borrowing.objects.filter(id=borrowing.id).update(
+        borrow_date=date.today() - timedelta(days=borrowed_days_ago),
+        expected_return_date=date.today() - timedelta(days=expected_days_ago),
+    )
+    borrowing.refresh_from_db()
+    return borrowing
+
+
+class OverdueReportTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@admin.com", password="qwer1234", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.book = Book.objects.create(
+            title="Sample", cover="Hard", inventory=10, daily_fee="0.75"
+        )
+        self.late = create_borrowing(self.user, self.book, 20, 10)
+        self.later = create_borrowing(self.user, self.book, 30, 12)
+        create_borrowing(self.user, self.book, 5, -2)
+        returned = create_borrowing(self.user, self.book, 30, 20)
+        Borrowing.objects.filter(id=returned.id).update(actual_return_date=date.today())
+
+    def test_list_overdue_borrowings_with_fines(self):
+        response = self.client.get(OVERDUE_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(
+            [
+                (row["id"], row["days_overdue"], row["fine"])
+                for row in response.data["results"]
+            ],
+            [(self.later.id, 12, "9.00"), (self.late.id, 10, "7.50")],
+        )
+        self.assertEqual(response.data["results"][0]["book_title"], "Sample")
+        self.assertEqual(response.data["results"][0]["user_email"], self.user.email)
+
+    def test_overdue_order_ignores_keyset_pagination(self):
+        response = self.client.get(
+            OVERDUE_URL, {"pagination": "keyset", "ordering": "id", "page_size": 1}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]], [self.later.id]
+        )
+
+    def test_overdue_scan_uses_partial_index(self):
+        plan = Borrowing.objects.overdue_report().explain()
+
+        self.assertIn("borrowing_overdue_idx", plan)
+
+    def test_overdue_access_denied(self):
+        user = get_user_model().objects.create_user(
+            email="user@user.com", password="qwer1234"
+        )
+        self.client.force_authenticate(user)
+
+        response = self.client.get(OVERDUE_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_overdue_report_command(self):
+        out, err = StringIO(), StringIO()
+        as_of = (date.today() + timedelta(days=1)).isoformat()
+
+        call_command(
+            "overdue_report",
+            "--format",
+            "ndjson",
+            "--date",
+            as_of,
+            stdout=out,
+            stderr=err,
+        )
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+
+        self.assertEqual([row["id"] for row in rows], [self.later.id, self.late.id])
+        self.assertEqual(
+            [Decimal(row["fine"]) for row in rows], [Decimal("9.75"), Decimal("8.25")]
+        )
+        self.assertIn("2 overdue borrowings, 18.00 in fines", err.getvalue())
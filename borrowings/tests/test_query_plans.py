@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+BORROWING_URL = reverse("borrowings:borrowing-list")
+USER_INDEX = "borrowing_user_return_idx"
+ACTIVE_INDEX = "borrowing_overdue_idx"
+
+
+def query_plans(client, params):
+    """EXPLAIN QUERY PLAN of every borrowing query a list request runs"""
+    with CaptureQueriesContext(connection) as context:
+        client.get(BORROWING_URL, params)
+
+    plans = []
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            if "borrowings_borrowing" not in query["sql"]:
+                continue
+            cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+            plans.append(" | ".join(row[-1] for row in cursor.fetchall()))
+    return plans
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+class BorrowingListQueryPlanTest(TestCase):
+    """Every list filter must be answered from an index, never a table scan"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="qwer1234"
+        )
+        self.admin = get_user_model().objects.create_user(
+            email="admin@admin.com", password="qwer1234", is_staff=True
+        )
+        book = Book.objects.create(
+            title="Sample", cover="Hard", inventory=10, daily_fee=1
+        )
+        for user in (self.user, self.admin):
+            Borrowing.objects.create(
+                user=user,
+                book=book,
+                expected_return_date=date.today() + timedelta(days=2),
+            )
+
+    def assert_uses_index(self, params, index):
+        plans = query_plans(self.client, params)
+
+        self.assertTrue(plans)
+        for plan in plans:
+            self.assertRegex(plan, f"USING (COVERING )?INDEX {index}")
+            self.assertNotRegex(plan, r"SCAN borrowings_borrowing(?! USING)")
+
+    def test_own_borrowings(self):
+        self.client.force_authenticate(self.user)
+
+        self.assert_uses_index({}, USER_INDEX)
+
+    def test_own_active_borrowings(self):
+        self.client.force_authenticate(self.user)
+
+        self.assert_uses_index({"is_active": "true"}, USER_INDEX)
+
+    def test_borrowings_of_users(self):
+        self.client.force_authenticate(self.admin)
+
+        self.assert_uses_index({"users": f"{self.user.id},{self.admin.id}"}, USER_INDEX)
+
+    def test_active_borrowings_of_users(self):
+        self.client.force_authenticate(self.admin)
+
+        self.assert_uses_index(
+            {"users": str(self.user.id), "is_active": "true"}, USER_INDEX
+        )
+
+    def test_all_active_borrowings(self):
+        self.client.force_authenticate(self.admin)
+
+        self.assert_uses_index({"is_active": "true"}, ACTIVE_INDEX)
@@ -0,0 +1,123 @@
+import os
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connections, router
+from django.test import AsyncClient, TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books import cache as catalogue_cache
+from books.tests.samples import book_detail_url
+from borrowings.models import Borrowing
+from borrowings.tests.test_borrowing_api import (
+    BORROWING_URL,
+    borrowing_return_url,
+    create_sample_book,
+)
+from library_service.replicas import PIN_KEY, use_replicas
+
+ALIAS = "replica_test"
+ASYNC_URLCONF = "library_service.async_urls"
+
+
+class ReadReplicaTest(TransactionTestCase):
+    """The backup API of sync_replicas waits for transactions, like TestCase's"""
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        connections.settings[ALIAS] = {
+            **connections["default"].settings_dict,
+            "NAME": os.path.join(directory.name, "replica.sqlite3"),
+        }
+        self.addCleanup(connections.settings.pop, ALIAS)
+        self.addCleanup(connections.__delitem__, ALIAS)
+        self.addCleanup(lambda: connections[ALIAS].close())
+        replicas = override_settings(DATABASE_REPLICAS=[ALIAS])
+        replicas.enable()
+        self.addCleanup(replicas.disable)
+        cache.clear()
+        caches[settings.CATALOGUE_CACHE_ALIAS].clear()
+        catalogue_cache.local_cache.clear()
+
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="qwer1234", is_staff=True
+        )
+        self.book = create_sample_book()
+        call_command("sync_replicas", stdout=StringIO())
+        # Not copied to the replica yet
+        self.borrowing = Borrowing.objects.create(
+            user=self.user,
+            book=self.book,
+            expected_return_date=date.today() + timedelta(days=2),
+        )
+
+        self.authorization = f"Bearer {AccessToken.for_user(self.user)}"
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=self.authorization)
+
+    def test_safe_requests_read_from_replica(self):
+        response = self.client.get(BORROWING_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 0)
+
+    @override_settings(ROOT_URLCONF=ASYNC_URLCONF)
+    async def test_async_requests_read_from_replica(self):
+        response = await AsyncClient().get(
+            BORROWING_URL, headers={"Authorization": self.authorization}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 0)
+
+    def test_unsafe_requests_read_from_primary(self):
+        response = self.client.patch(
+            borrowing_return_url(self.borrowing.id),
+            {"actual_return_date": date.today() + timedelta(days=1)},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_writes_pin_user_to_primary(self):
+        self.client.post(
+            BORROWING_URL,
+            {
+                "book": self.book.id,
+                "expected_return_date": date.today() + timedelta(days=3),
+            },
+        )
+
+        response = self.client.get(BORROWING_URL)
+
+        self.assertEqual(response.data["count"], 2)
+        # Other worker processes see the pin too
+        self.assertTrue(caches["catalogue"].get(PIN_KEY.format(f"user:{self.user.id}")))
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(router.db_for_read(Borrowing), "default")
+        token = use_replicas.set(True)
+        self.addCleanup(use_replicas.reset, token)
+
+        self.assertEqual(router.db_for_read(Borrowing), ALIAS)
+        self.assertEqual(router.db_for_write(Borrowing), "default")
+
+    def test_catalogue_cache_is_filled_from_primary(self):
+        self.book.title = "New"
+        self.book.save()
+
+        response = self.client.get(book_detail_url(self.book.id))
+        self.assertEqual(response.data["title"], "New")
+
+        call_command("sync_replicas", stdout=StringIO())
+        catalogue_cache.local_cache.clear()
+        response = self.client.get(book_detail_url(self.book.id))
+
+        self.assertEqual(response.data["title"], "New")
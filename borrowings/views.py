@@ -1,3 +1,4 @@
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets, permissions, mixins, status
 from rest_framework.decorators import action
@@ -5,14 +6,41 @@ from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 
 from borrowings.models import Borrowing
+from borrowings.operations import (
+    OUTCOME_ALREADY_RETURNED,
+    OUTCOME_NOT_FOUND,
+    OUTCOME_RETURN_BEFORE_BORROW,
+    OUTCOME_RETURNED,
+    checkout_books,
+    return_borrowing,
+    return_borrowings,
+)
 from borrowings.serializers import (
     BorrowingListRetrieveSerializer,
     BorrowingCreateSerializer,
+    BorrowingCheckoutSerializer,
     BorrowingReturnSerializer,
+    BorrowingBulkReturnSerializer,
+    BorrowingOverdueSerializer,
 )
+from library_service.export import EXPORT_CHUNK_SIZE, export_response
+from library_service.pagination import KeysetPagination, SizedPageNumberPagination
+from library_service.sparse import SparseFieldsetMixin
+
+BORROWING_EXPORT_FIELDS = {
+    "id": "id",
+    "borrow_date": "borrow_date",
+    "expected_return_date": "expected_return_date",
+    "actual_return_date": "actual_return_date",
+    "book": "book_id",
+    "book_title": "book__title",
+    "user": "user_id",
+    "user_email": "user__email",
+}
 
 
 class BorrowingViewSet(
+    SparseFieldsetMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -20,9 +48,22 @@ class BorrowingViewSet(
 ):
     queryset = Borrowing.objects.all().select_related("book", "user")
     serializer_class = BorrowingCreateSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering_fields = ("borrow_date", "expected_return_date")
+    lookup_value_regex = r"\d+"
+    sparse_field_columns = {
+        "borrow_date": ["borrow_date"],
+        "expected_return_date": ["expected_return_date"],
+        "actual_return_date": ["actual_return_date"],
+        "book": ["book"],
+        "user": ["user"],
+    }
+    expandable_fields = ("book",)
 
     def get_queryset(self):
-        queryset = Borrowing.objects.all().select_related("book", "user")
+        queryset = self.project_queryset(Borrowing.objects.all())
+        if self.is_expanded("book"):
+            queryset = queryset.select_related("book").prefetch_related("book__authors")
         is_active = self.request.query_params.get("is_active")
         users = self.request.query_params.get("users")
 
@@ -40,40 +81,120 @@ class BorrowingViewSet(
     def get_serializer_class(self):
         if self.action == "create":
             return BorrowingCreateSerializer
+        if self.action == "checkout":
+            return BorrowingCheckoutSerializer
         if self.action == "return_borrowing":
             return BorrowingReturnSerializer
+        if self.action == "bulk_return":
+            return BorrowingBulkReturnSerializer
+        if self.action == "overdue":
+            return BorrowingOverdueSerializer
         return BorrowingListRetrieveSerializer
 
     def get_permissions(self):
-        if self.action in ("list", "create", "retrieve"):
+        if self.action in ("list", "create", "retrieve", "checkout"):
             self.permission_classes = [permissions.IsAuthenticated]
-        if self.action == "return_borrowing":
+        if self.action in ("return_borrowing", "bulk_return", "export", "overdue"):
             self.permission_classes = [permissions.IsAdminUser]
 
         return super(BorrowingViewSet, self).get_permissions()
 
     def perform_create(self, serializer):
         if self.action == "create":
-            serializer.save(user=self.request.user, actual_return_date=None)
+            serializer.save(user=self.request.user)
 
     def get_object(self):
         obj = get_object_or_404(self.get_queryset(), pk=self.kwargs["pk"])
         self.check_object_permissions(self.request, obj)
         return obj
 
+    @extend_schema(responses={201: BorrowingCreateSerializer(many=True)})
+    @action(detail=False, methods=["post"])
+    def checkout(self, request):
+        """
+        Borrow several books at once, or none of them when some are not
+        available (409 with the list of unavailable books)
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        borrowings = checkout_books(
+            request.user,
+            serializer.validated_data["books"],
+            serializer.validated_data["expected_return_date"],
+        )
+
+        return Response(
+            BorrowingCreateSerializer(borrowings, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
     @action(detail=True, methods=["patch"], url_path="return")
     def return_borrowing(self, request, pk):
-        borrowing = get_object_or_404(self.get_queryset(), id=pk)
-        serializer = BorrowingReturnSerializer(
-            borrowing,
-            data=request.data,
-            partial=True,
-            context={"borrow_date": borrowing.borrow_date},
+        serializer = BorrowingReturnSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        borrowing = return_borrowing(
+            pk, serializer.validated_data["actual_return_date"]
         )
+
+        return Response(
+            BorrowingReturnSerializer(borrowing).data, status=status.HTTP_200_OK
+        )
+
+    @extend_schema(
+        responses={
+            200: {
+                "type": "object",
+                "additionalProperties": {
+                    "type": "string",
+                    "enum": [
+                        OUTCOME_RETURNED,
+                        OUTCOME_ALREADY_RETURNED,
+                        OUTCOME_NOT_FOUND,
+                        OUTCOME_RETURN_BEFORE_BORROW,
+                    ],
+                },
+            }
+        }
+    )
+    @action(detail=False, methods=["post"], url_path="bulk-return")
+    def bulk_return(self, request):
+        """Return many borrowings on one date, reporting the outcome per id"""
+        serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        outcomes = return_borrowings(
+            serializer.validated_data["ids"],
+            serializer.validated_data["actual_return_date"],
+        )
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(outcomes, status=status.HTTP_200_OK)
+
+    # Without keyset pagination, which would reorder the report
+    @action(detail=False, methods=["get"], pagination_class=SizedPageNumberPagination)
+    def overdue(self, request):
+        """
+        Borrowings not returned by their expected return date with the fines
+        accrued so far, most overdue first
+        """
+        page = self.paginate_queryset(Borrowing.objects.overdue_report())
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(responses=OpenApiTypes.STR)
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"export/(?P<export_format>ndjson|csv)",
+    )
+    def export(self, request, export_format):
+        """Stream the whole borrowing history as NDJSON or CSV"""
+        columns = list(BORROWING_EXPORT_FIELDS)
+        borrowings = (
+            Borrowing.objects.order_by("id")
+            .values_list(*BORROWING_EXPORT_FIELDS.values())
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        rows = (dict(zip(columns, values)) for values in borrowings)
+        return export_response(rows, columns, export_format, "borrowings")
 
     @extend_schema(
         parameters=[
@@ -87,6 +208,7 @@ class BorrowingViewSet(
                 description="Filter Borrowings by User",
                 type={"type": "list", "items": {"type": "number"}},
             ),
+            *SparseFieldsetMixin.get_sparse_schema_parameters(),
         ]
     )
     def list(self, request, *args, **kwargs):
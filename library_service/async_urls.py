@@ -0,0 +1,21 @@
+"""
+URL configuration which serves the endpoints that have native async views
+with them, and everything else like library_service.urls. Select it with
+DJANGO_ROOT_URLCONF=library_service.async_urls when running under ASGI.
+"""
+from django.urls import include, path
+
+from library_service import urls
+
+ASYNC_NAMESPACES = {
+    "user": "users.async_urls",
+    "library": "books.async_urls",
+    "borrowings": "borrowings.async_urls",
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), include(ASYNC_NAMESPACES[pattern.namespace]))
+    if getattr(pattern, "namespace", None) in ASYNC_NAMESPACES
+    else pattern
+    for pattern in urls.urlpatterns
+]
@@ -0,0 +1,170 @@
+import json
+from io import BytesIO
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import JsonResponse, QueryDict
+from django.urls import re_path
+from django.utils.cache import patch_vary_headers
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from library_service.pagination import AsyncPageNumberPagination
+
+FORM_CONTENT_TYPES = ("application/x-www-form-urlencoded", "multipart/form-data")
+
+
+class AsyncAPIView(View):
+    """
+    A native async Django view which speaks JSON like the DRF views: it
+    parses JSON, form and multipart bodies of any method, authenticates with
+    the DRF authentication classes and renders APIExceptions as DRF does.
+    """
+
+    authentication_classes = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # csrf_exempt() of Django 4.2 hides that the view is a coroutine
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            response = await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            response = self.handle_exception(exc)
+        # As APIView.finalize_response() does, for content negotiation
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+    def handle_exception(self, exc):
+        detail = exc.detail
+        if not isinstance(detail, (list, dict)):
+            detail = {"detail": detail}
+        response = JsonResponse(detail, status=exc.status_code, safe=False)
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            authenticate_header = self.get_authenticate_header(self.request)
+            if authenticate_header:
+                response["WWW-Authenticate"] = authenticate_header
+            else:
+                response.status_code = status.HTTP_403_FORBIDDEN
+        return response
+
+    def get_authenticate_header(self, request):
+        authenticators = self.get_authenticators()
+        if authenticators:
+            return authenticators[0].authenticate_header(request)
+
+    def get_authenticators(self):
+        classes = self.authentication_classes
+        if classes is None:
+            classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        return [auth() for auth in classes]
+
+    async def authenticate(self, request):
+        """
+        Return the authenticated user or None. Authentication classes without
+        an async aauthenticate() run in a worker thread, because they may
+        query the database.
+        """
+        for authenticator in self.get_authenticators():
+            if hasattr(authenticator, "aauthenticate"):
+                result = await authenticator.aauthenticate(request)
+            else:
+                result = await sync_to_async(authenticator.authenticate)(request)
+            if result is not None:
+                return result[0]
+        return None
+
+    def get_data(self, request):
+        """
+        Data of a JSON, form or multipart body, for any method. Django only
+        parses the form bodies of POST requests into request.POST.
+        """
+        content_type = request.content_type
+        if content_type == "application/json":
+            try:
+                return json.loads(request.body or b"{}")
+            except ValueError as exc:
+                raise exceptions.ParseError(f"JSON parse error - {exc}")
+        if content_type not in FORM_CONTENT_TYPES:
+            if request.body:
+                raise exceptions.UnsupportedMediaType(content_type)
+            return QueryDict()
+        if request.method == "POST":
+            return request.POST
+        if content_type == "multipart/form-data":
+            data, _ = request.parse_file_upload(request.META, BytesIO(request.body))
+            return data
+        return QueryDict(request.body, encoding=request.encoding)
+
+
+class AsyncReadView(AsyncAPIView):
+    """
+    Serve GET requests which only use async_query_params with the async
+    handlers, and hand every other request to the DRF viewset. The async
+    handlers reuse get_queryset() and the page size settings of the viewset,
+    with the async ORM.
+    """
+
+    viewset = None
+    # As for ViewSet.as_view(), the "get" action is the one served async
+    viewset_actions = None
+    async_query_params = ()
+    sync_view = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        initkwargs.setdefault("sync_view", cls.viewset.as_view(cls.viewset_actions))
+        return super().as_view(**initkwargs)
+
+    async def dispatch(self, request, *args, **kwargs):
+        if not self.is_async_request(request, kwargs):
+            return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+        return await super().dispatch(request, *args, **kwargs)
+
+    def is_async_request(self, request, kwargs):
+        """GETs of JSON, without format suffixes or other query parameters"""
+        return (
+            request.method == "GET"
+            and "format" not in kwargs
+            and "text/html" not in request.headers.get("Accept", "")
+            and set(request.GET) <= set(self.async_query_params)
+        )
+
+    def get_viewset(self, request, user):
+        request = Request(request)
+        request.user = user or AnonymousUser()
+        return self.viewset(
+            request=request,
+            action=self.viewset_actions["get"],
+            args=self.args,
+            kwargs=self.kwargs,
+            format_kwarg=None,
+        )
+
+    @staticmethod
+    def get_paginator(viewset):
+        paginator = AsyncPageNumberPagination()
+        for name in ("page_size", "page_size_query_param", "max_page_size"):
+            setattr(paginator, name, getattr(viewset.paginator, name))
+        return paginator
+
+
+def replace_views(patterns, views):
+    """
+    Replace the views of the URL patterns named in views, keeping the
+    order and the regexes of the patterns
+    """
+    return [
+        re_path(str(pattern.pattern), views[pattern.name], name=pattern.name)
+        if pattern.name in views
+        else pattern
+        for pattern in patterns
+    ]
@@ -0,0 +1,84 @@
+"""
+Helpers shared by the ``benchmark_*`` management commands.
+
+Benchmarks seed synthetic data inside a transaction which is rolled back
+at the end, so they can be run against a development database safely.
+"""
+import random
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import transaction
+
+WORDS = (
+    "river night garden stone silver winter shadow island letters empire "
+    "music forest secret summer mountain ocean journey memory glass kingdom "
+    "city dream fire storm light machine history mirror harbor voices"
+).split()
+FIRST_NAMES = "Anna Ivan Lesya Taras Olga Mark Maria Petro Sofia Yurii".split()
+LAST_NAMES = "Franko Shevchenko Ukrainka Kotsiubynsky Stus Zhadan Andrukhovych".split()
+SYLLABLES = "ka lo mi ra ven dor sil ta ne vor lin ga be ru so".split()
+
+
+def rare_word(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(4))
+
+
+@contextmanager
+def rolled_back():
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def measure(func, repeat=5):
+    """Run func repeat times and return (best, median) duration in seconds"""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started)
+    return min(durations), statistics.median(durations)
+
+
+def format_ms(seconds):
+    return f"{seconds * 1000:.2f} ms"
+
+
+def seed_catalogue(books, authors=None, seed=42):
+    """Bulk insert synthetic authors and books, return the list of book ids"""
+    from books import search
+    from books.models import Author, Book
+
+    rng = random.Random(seed)
+    authors = authors or max(books // 10, 1)
+    author_objects = Author.objects.bulk_create(
+        Author(
+            first_name=f"{rng.choice(FIRST_NAMES)}{index}",
+            last_name=rng.choice(LAST_NAMES),
+        )
+        for index in range(authors)
+    )
+    book_objects = Book.objects.bulk_create(
+        (
+            Book(
+                title=" ".join([*rng.sample(WORDS, 2), rare_word(rng)]).capitalize(),
+                cover=rng.choice(Book.Cover.values),
+                inventory=rng.randint(0, 20),
+                daily_fee=rng.randint(1, 500) / 100,
+            )
+            for _ in range(books)
+        ),
+        batch_size=1000,
+    )
+    Book.authors.through.objects.bulk_create(
+        (
+            Book.authors.through(book_id=book.id, author_id=author.id)
+            for book in book_objects
+            for author in rng.sample(author_objects, min(2, len(author_objects)))
+        ),
+        batch_size=1000,
+    )
+    search.rebuild_index()
+    return [book.id for book in book_objects]
@@ -0,0 +1,231 @@
+"""
+Request metrics: MetricsMiddleware times every request and the queries it
+runs on all databases, reports both in a Server-Timing header and adds them
+to histograms per view, e.g. BookViewSet.list, which the metrics endpoint
+renders in the Prometheus text format. Like the stats counters, metrics are
+kept per worker process.
+
+Streaming responses are timed until their headers are ready, without the
+queries run while their content is streamed.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED = "unmatched"
+
+
+class QueryTimer:
+    """Number and duration of the queries of a request"""
+
+    __slots__ = ("queries", "duration")
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+
+current_timer = ContextVar("query_timer", default=None)
+
+
+def time_queries(execute, sql, params, many, context):
+    """execute_wrapper which adds the queries to the timer of the request"""
+    timer = current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.duration += time.perf_counter() - started
+        timer.queries += 1
+
+
+@receiver(connection_created)
+def install_query_timer(connection, **kwargs):
+    """
+    Wrap all queries of the connection for good, which is cheaper than
+    execute_wrapper() on each connection of each request. It goes first, as
+    execute_wrapper() removes the last wrapper.
+    """
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, time_queries)
+
+
+class Histogram:
+    """Thread-safe Prometheus histogram with a series per value of one label"""
+
+    registry = []
+
+    def __init__(self, name, documentation, label, buckets, lock=None):
+        """Histograms which are observed together may share a lock"""
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = tuple(sorted(buckets))
+        self.lock = lock or threading.Lock()
+        # Label value -> [count per bucket and +Inf, sum]
+        self._series = {}
+        Histogram.registry.append(self)
+
+    def observe(self, label_value, value):
+        with self.lock:
+            self.add(label_value, value)
+
+    def add(self, label_value, value):
+        """observe() for callers which hold the lock"""
+        series = self._series.get(label_value)
+        if series is None:
+            series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                label_value: (list(counts), total)
+                for label_value, (counts, total) in self._series.items()
+            }
+
+    def reset(self):
+        with self.lock:
+            self._series.clear()
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        bounds = [repr(float(bucket)) for bucket in self.buckets] + ["+Inf"]
+        for label_value, (counts, total) in sorted(self.snapshot().items()):
+            labels = f'{self.label}="{escape_label(label_value)}"'
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return "\n".join(lines)
+
+
+def escape_label(value):
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+request_lock = threading.Lock()
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Duration of requests per view.",
+    "view",
+    settings.REQUEST_METRICS_DURATION_BUCKETS,
+    request_lock,
+)
+db_duration = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in database queries per request, per view.",
+    "view",
+    settings.REQUEST_METRICS_DURATION_BUCKETS,
+    request_lock,
+)
+db_queries = Histogram(
+    "http_request_db_queries",
+    "Database queries per request, per view.",
+    "view",
+    settings.REQUEST_METRICS_QUERY_BUCKETS,
+    request_lock,
+)
+
+
+def render_metrics():
+    return "\n".join(histogram.render() for histogram in Histogram.registry) + "\n"
+
+
+# (view function, method) -> view name, as many as URL patterns and methods
+view_names = {}
+
+
+def get_view_name(request):
+    """
+    Class and action of the view which served the request, as
+    BookViewSet.list, or the method for views without actions, as
+    StatsView.get. Other views are named by their URL pattern.
+    """
+    match = request.resolver_match
+    if match is None:
+        return UNMATCHED
+    key = (match.func, request.method)
+    name = view_names.get(key)
+    if name is None:
+        name = view_names[key] = build_view_name(match, request.method.lower())
+    return name
+
+
+def build_view_name(match, method):
+    view = getattr(match.func, "cls", None) or getattr(match.func, "view_class", None)
+    if view is None:
+        return match.view_name or match.func.__qualname__
+    actions = getattr(match.func, "actions", None) or {}
+    return f"{view.__name__}.{actions.get(method, method)}"
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        # Connections of this thread from before the receiver was connected
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        token = current_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        return self.record(request, response, timer, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        # sync_to_async() copies the context, so the async ORM and sync views
+        # add to the timer from their threads
+        timer = QueryTimer()
+        token = current_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        return self.record(request, response, timer, time.perf_counter() - started)
+
+    @staticmethod
+    def record(request, response, timer, duration):
+        view_name = get_view_name(request)
+        with request_lock:
+            request_duration.add(view_name, duration)
+            db_duration.add(view_name, timer.duration)
+            db_queries.add(view_name, timer.queries)
+        response["Server-Timing"] = (
+            f'db;dur={timer.duration * 1000:.2f};desc="{timer.queries} queries", '
+            f"total;dur={duration * 1000:.2f}"
+        )
+        return response
@@ -0,0 +1,235 @@
+import hashlib
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import InvalidPage, Page
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def get_model_field(queryset, name):
+    """The model field or the output field of the annotation name"""
+    if name in queryset.query.annotations:
+        return queryset.query.annotations[name].output_field
+    return queryset.model._meta.get_field(name)
+
+
+def get_row_value(row, field):
+    if isinstance(row, dict):
+        return row[field]
+    return getattr(row, field)
+
+
+class SizedPageNumberPagination(PageNumberPagination):
+    """Page number pagination whose clients may choose the page size"""
+
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class KeysetPagination(SizedPageNumberPagination):
+    """
+    Page number pagination which switches to keyset (seek) pagination when
+    the client asks for it with ``?pagination=keyset`` or follows a ``cursor``.
+
+    Keyset pages are ordered by ``(ordering key, id)`` and fetched with
+    ``WHERE (key, id) > (last key, last id)``, so every page costs the same
+    no matter how deep it is. The total count is only computed when asked
+    for with ``?count=true`` and is cached for ``PAGINATION_COUNT_CACHE_TIMEOUT``.
+
+    Views list the fields clients may order by in ``keyset_ordering_fields``.
+    """
+
+    mode_query_param = "pagination"
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.is_keyset_request(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, view)
+        self.count = None
+        if request.query_params.get(self.count_query_param, "").lower() == "true":
+            self.count = self.get_cached_count(queryset)
+
+        field = self.ordering.lstrip("-")
+        descending = self.ordering.startswith("-")
+        if field == "id":
+            queryset = queryset.order_by(self.ordering)
+        else:
+            queryset = queryset.order_by(self.ordering, "-id" if descending else "id")
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            cursor = self.decode_cursor(cursor, get_model_field(queryset, field))
+            queryset = queryset.filter(self.get_seek_filter(field, descending, cursor))
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page_rows = rows[: self.page_size]
+        return self.page_rows
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        response = OrderedDict()
+        if self.count is not None:
+            response["count"] = self.count
+        response["next"] = self.get_next_link()
+        response["results"] = data
+        return Response(response)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+
+        last_row = self.page_rows[-1]
+        field = self.ordering.lstrip("-")
+        cursor = self.encode_cursor(
+            [get_row_value(last_row, field), get_row_value(last_row, "id")]
+        )
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        url = replace_query_param(url, self.mode_query_param, "keyset")
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def is_keyset_request(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "keyset"
+            or self.cursor_query_param in request.query_params
+        )
+
+    def get_ordering(self, request, view):
+        allowed = getattr(view, "keyset_ordering_fields", ())
+        ordering = request.query_params.get(self.ordering_query_param, "id")
+        if ordering.lstrip("-") in ("id", *allowed):
+            return ordering
+        return "id"
+
+    @staticmethod
+    def get_seek_filter(field, descending, cursor):
+        value, last_id = cursor
+        after = "lt" if descending else "gt"
+        if field == "id":
+            return Q(**{f"id__{after}": last_id})
+        return Q(**{f"{field}__{after}": value}) | Q(
+            **{field: value, f"id__{after}": last_id}
+        )
+
+    @staticmethod
+    def encode_cursor(values):
+        return urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+    def decode_cursor(self, cursor, field):
+        """The (value, id) of the cursor, with the value converted for field"""
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode()))
+            value, last_id = values
+            return field.to_python(value), int(last_id)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def get_cached_count(queryset):
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        key = "pagination-count:" + hashlib.sha1(f"{sql}{params}".encode()).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+        return count
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        ordering_fields = ", ".join(
+            ("id", *getattr(view, "keyset_ordering_fields", ()))
+        )
+        parameters += [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to `keyset` to page with cursors instead of "
+                "page numbers",
+                "schema": {"type": "string", "enum": ["keyset"]},
+            },
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Keyset pagination cursor taken from the `next` link",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.ordering_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Keyset pagination ordering, one of "
+                f"{ordering_fields}; prefix with `-` for descending order",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Include the (cached) total count in keyset pages",
+                "schema": {"type": "boolean"},
+            },
+        ]
+        return parameters
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """
+    PageNumberPagination for async views, which counts and reads the page
+    with the async ORM and returns the page as data for a JsonResponse
+    """
+
+    async def apaginate_queryset(self, queryset, request):
+        page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+
+        bottom = (number - 1) * page_size
+        rows = [row async for row in queryset[bottom : bottom + page_size]]
+        self.page = Page(rows, number, paginator)
+        self.request = request
+        return rows
+
+    def get_paginated_data(self, data):
+        return OrderedDict(
+            [
+                ("count", self.page.paginator.count),
+                ("next", self.get_next_link()),
+                ("previous", self.get_previous_link()),
+                ("results", data),
+            ]
+        )
@@ -0,0 +1,141 @@
+"""
+Read replicas: ReplicaMiddleware lets the reads of GET, HEAD and OPTIONS
+requests go to the DATABASE_REPLICAS, and ReplicaRouter sends them to a
+random one. Writes, reads of other requests and reads outside requests go to
+the primary database.
+
+A replica lags behind the primary, so a user who wrote is pinned to the
+primary for DATABASE_REPLICA_PIN_SECONDS and reads their own writes.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+
+from users.authentication import CachedJWTAuthentication
+
+PIN_KEY = "replica_pin:{}"
+
+use_replicas = ContextVar("use_replicas", default=False)
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary database, also in requests using replicas"""
+    token = use_replicas.set(False)
+    try:
+        yield
+    finally:
+        use_replicas.reset(token)
+
+
+class ReplicaRouter:
+    # The cache table and sessions are read right after they are written
+    primary_apps = {"django_cache", "sessions"}
+    # Catalogue versions too, and they must not lag behind the responses
+    # cached under them
+    primary_models = {"books.catalogueversion"}
+
+    def db_for_read(self, model, **hints):
+        if (
+            not settings.DATABASE_REPLICAS
+            or not use_replicas.get()
+            or model._meta.app_label in self.primary_apps
+            or model._meta.label_lower in self.primary_models
+            # Reads in a write transaction must see its writes
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return None
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS if settings.DATABASE_REPLICAS else None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copies of the primary database, with its schema
+        return False if db in settings.DATABASE_REPLICAS else None
+
+
+def get_pin_key(request):
+    """
+    Key of the user id of the JWT of the request, or of its session. The
+    token is only verified, which is cached, the view loads the user.
+    """
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is not None:
+        try:
+            validated_token = authentication.get_validated_token(raw_token)
+            return PIN_KEY.format(f"user:{authentication.get_user_id(validated_token)}")
+        except APIException:
+            return None
+    session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if session_key:
+        return PIN_KEY.format(f"session:{session_key}")
+    return None
+
+
+def get_pin_cache():
+    return caches[settings.DATABASE_REPLICA_PIN_CACHE_ALIAS]
+
+
+class ReplicaMiddleware:
+    """
+    Read from the replicas in requests with safe methods of clients which
+    did not write in the last DATABASE_REPLICA_PIN_SECONDS
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        pin_key = get_pin_key(request)
+        pinned = pin_key is not None and get_pin_cache().get(pin_key)
+        token = use_replicas.set(request.method in SAFE_METHODS and not pinned)
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replicas.reset(token)
+        if request.method not in SAFE_METHODS and pin_key is not None:
+            get_pin_cache().set(pin_key, True, settings.DATABASE_REPLICA_PIN_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        pin_key = get_pin_key(request)
+        pinned = pin_key is not None and await get_pin_cache().aget(pin_key)
+        token = use_replicas.set(request.method in SAFE_METHODS and not pinned)
+        try:
+            response = await self.get_response(request)
+        finally:
+            use_replicas.reset(token)
+        if request.method not in SAFE_METHODS and pin_key is not None:
+            await get_pin_cache().aset(
+                pin_key, True, settings.DATABASE_REPLICA_PIN_SECONDS
+            )
+        return response
@@ -51,10 +51,13 @@ INSTALLED_APPS = [
     "users",
     "books",
     "borrowings",
+    "analytics",
 ]
 
 MIDDLEWARE = [
+    "library_service.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "library_service.replicas.ReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -63,7 +66,10 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
-ROOT_URLCONF = "library_service.urls"
+# library_service.async_urls serves the endpoints which have native async views
+# with them, for ASGI servers
+
+ROOT_URLCONF = os.environ.get("DJANGO_ROOT_URLCONF", "library_service.urls")
 
 TEMPLATES = [
     {
@@ -89,11 +95,139 @@ WSGI_APPLICATION = "library_service.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "ENGINE": "library_service.sqlite_backend",
+        "NAME": os.environ.get("DJANGO_DB_NAME", BASE_DIR / "db.sqlite3"),
     }
 }
 
+# DJANGO_DB_PROFILE=production turns on WAL journaling and the other pragmas
+# below on every connection, BEGIN IMMEDIATE write transactions and persistent
+# connections (DJANGO_DB_CONN_MAX_AGE seconds, forever by default)
+
+DB_PROFILE = os.environ.get("DJANGO_DB_PROFILE", "development")
+
+SQLITE_PRODUCTION_OPTIONS = {
+    "pragmas": {
+        "journal_mode": "WAL",
+        "busy_timeout": int(os.environ.get("DJANGO_SQLITE_BUSY_TIMEOUT", 5000)),
+        "synchronous": "NORMAL",
+        "mmap_size": int(os.environ.get("DJANGO_SQLITE_MMAP_SIZE", 256 * 1024**2)),
+        # Negative sizes are in KiB
+        "cache_size": int(os.environ.get("DJANGO_SQLITE_CACHE_SIZE", -64000)),
+    },
+    "transaction_mode": "IMMEDIATE",
+}
+
+if DB_PROFILE == "production":
+    DATABASES["default"].update(
+        OPTIONS=SQLITE_PRODUCTION_OPTIONS,
+        CONN_MAX_AGE=(
+            int(os.environ["DJANGO_DB_CONN_MAX_AGE"])
+            if "DJANGO_DB_CONN_MAX_AGE" in os.environ
+            else None
+        ),
+        CONN_HEALTH_CHECKS=True,
+    )
+
+# Read replicas
+# DJANGO_DB_REPLICAS lists copies of the primary database, comma-separated
+# paths of SQLite files kept up to date with `python manage.py sync_replicas`
+# or a replication tool. GET, HEAD and OPTIONS requests read from a random
+# replica, unless their user wrote in the last DJANGO_DB_REPLICA_PIN_SECONDS.
+# Pins are kept in the DATABASE_REPLICA_PIN_CACHE_ALIAS cache, which must be
+# shared by all worker processes, by default the catalogue DatabaseCache.
+
+DATABASE_REPLICAS = []
+
+for index, path in enumerate(os.environ.get("DJANGO_DB_REPLICAS", "").split(",")):
+    if path.strip():
+        alias = f"replica_{index + 1}"
+        DATABASES[alias] = {
+            **DATABASES["default"],
+            "NAME": path.strip(),
+            "TEST": {"MIRROR": "default"},
+        }
+        DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["library_service.replicas.ReplicaRouter"]
+
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get("DJANGO_DB_REPLICA_PIN_SECONDS", 5))
+
+DATABASE_REPLICA_PIN_CACHE_ALIAS = "catalogue"
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The catalogue cache is shared by all worker processes, its table is created
+# by migrations or with `python manage.py createcachetable`
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "catalogue": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "catalogue_cache",
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    },
+}
+
+CATALOGUE_CACHE_ALIAS = "catalogue"
+
+CATALOGUE_CACHE_TIMEOUT = int(os.environ.get("DJANGO_CATALOGUE_CACHE_TIMEOUT", 300))
+
+CATALOGUE_CACHE_LOCAL_SIZE = int(
+    os.environ.get("DJANGO_CATALOGUE_CACHE_LOCAL_SIZE", 512)
+)
+
+
+# Seconds for which clients and proxies may reuse anonymous catalogue responses
+# before revalidating them with If-None-Match
+
+CATALOGUE_HTTP_MAX_AGE = int(os.environ.get("DJANGO_CATALOGUE_HTTP_MAX_AGE", 0))
+
+
+# Build book list/retrieve responses from values() rows instead of serializers
+
+CATALOGUE_FAST_SERIALIZATION = bool(
+    os.environ.get("DJANGO_CATALOGUE_FAST_SERIALIZATION", False)
+)
+
+
+# In-process cache of book inventory used by the availability endpoint. Saves
+# in this process update it at once, other processes see them after the timeout
+
+BOOK_INVENTORY_CACHE_SIZE = int(
+    os.environ.get("DJANGO_BOOK_INVENTORY_CACHE_SIZE", 20000)
+)
+
+BOOK_INVENTORY_CACHE_TIMEOUT = int(
+    os.environ.get("DJANGO_BOOK_INVENTORY_CACHE_TIMEOUT", 5)
+)
+
+BOOK_AVAILABILITY_MAX_IDS = int(
+    os.environ.get("DJANGO_BOOK_AVAILABILITY_MAX_IDS", 5000)
+)
+
+
+# In-process caches of verified JWT claims and of the id, is_staff and is_active
+# of their users, used by CachedJWTAuthentication. Saves of a user in this
+# process drop its entry, other processes see them after the timeout
+
+AUTH_CACHE_SIZE = int(os.environ.get("DJANGO_AUTH_CACHE_SIZE", 10000))
+
+AUTH_CACHE_TIMEOUT = int(os.environ.get("DJANGO_AUTH_CACHE_TIMEOUT", 60))
+
+
+# Threads which hash and verify passwords for the async user views
+
+PASSWORD_HASHING_WORKERS = int(os.environ.get("DJANGO_PASSWORD_HASHING_WORKERS", 2))
+
+
+# Maximum number of borrowings a user may have not returned at the same time
+
+BORROWING_LIMIT = int(os.environ.get("DJANGO_BORROWING_LIMIT", 10))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
@@ -139,14 +273,40 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("users.authentication.CachedJWTAuthentication",),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 100,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Seconds for which total counts of keyset paginated lists are cached
+PAGINATION_COUNT_CACHE_TIMEOUT = int(
+    os.environ.get("DJANGO_PAGINATION_COUNT_CACHE_TIMEOUT", 60)
+)
+
+# Count the queries and time the requests per view, reported in Server-Timing
+# headers and in the Prometheus format by /metrics/, per worker process
+
+REQUEST_METRICS = bool(os.environ.get("DJANGO_REQUEST_METRICS", True))
+
+REQUEST_METRICS_DURATION_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+
+REQUEST_METRICS_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
 SIMPLE_JWT = {"ACCESS_TOKEN_LIFETIME": timedelta(minutes=15)}
 
 SPECTACULAR_SETTINGS = {
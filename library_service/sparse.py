@@ -0,0 +1,96 @@
+from rest_framework import serializers
+
+
+class SparseFieldsetMixin:
+    """
+    Sparse fieldsets for list and retrieve responses.
+
+    ``?fields=id,title`` keeps only the listed serializer fields and loads
+    only the model fields they read. Relations in ``expandable_fields`` are
+    nested by default; once ``?expand=`` is given only the relations it
+    names are nested and the others are rendered as primary keys.
+
+    Views map serializer fields to the model fields they read in
+    ``sparse_field_columns`` and check is_field_needed() / is_expanded()
+    before joining or prefetching relations.
+    """
+
+    fields_query_param = "fields"
+    expand_query_param = "expand"
+    sparse_field_columns = {}
+    expandable_fields = ()
+
+    def get_sparse_fields(self):
+        if self.action not in ("list", "retrieve"):
+            return None
+        fields = self.request.query_params.get(self.fields_query_param)
+        if fields is None:
+            return None
+        return [field.strip() for field in fields.split(",") if field.strip()]
+
+    def get_expanded_fields(self):
+        if self.action not in ("list", "retrieve"):
+            return None
+        expand = self.request.query_params.get(self.expand_query_param)
+        if expand is None:
+            return None
+        return {field.strip() for field in expand.split(",") if field.strip()}
+
+    def is_field_needed(self, field):
+        fields = self.get_sparse_fields()
+        return fields is None or field in fields
+
+    def is_expanded(self, field):
+        expanded = self.get_expanded_fields()
+        return self.is_field_needed(field) and (expanded is None or field in expanded)
+
+    def project_queryset(self, queryset):
+        """Load only the model fields read by the requested serializer fields"""
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+
+        columns = {"id"}
+        for field in fields:
+            columns.update(self.sparse_field_columns.get(field, ()))
+        ordering = self.request.query_params.get("ordering", "").lstrip("-")
+        if ordering in getattr(self, "keyset_ordering_fields", ()):
+            columns.add(ordering)
+        return queryset.only(*columns)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super(SparseFieldsetMixin, self).get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        expanded = self.get_expanded_fields()
+        if fields is None and expanded is None:
+            return serializer
+
+        target = getattr(serializer, "child", serializer)
+        for name in list(target.fields):
+            if not self.is_field_needed(name):
+                target.fields.pop(name)
+            elif name in self.expandable_fields and not self.is_expanded(name):
+                target.fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+        return serializer
+
+    @classmethod
+    def get_sparse_schema_parameters(cls):
+        from drf_spectacular.utils import OpenApiParameter
+
+        parameters = [
+            OpenApiParameter(
+                name=cls.fields_query_param,
+                description="Comma separated fields to include in the response",
+                type=str,
+            )
+        ]
+        if cls.expandable_fields:
+            parameters.append(
+                OpenApiParameter(
+                    name=cls.expand_query_param,
+                    description="Comma separated relations to nest, others are "
+                    f"returned as ids. One of: {', '.join(cls.expandable_fields)}",
+                    type=str,
+                )
+            )
+        return parameters
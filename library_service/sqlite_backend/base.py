@@ -0,0 +1,34 @@
+"""
+SQLite backend which tunes every new connection with the ``pragmas`` of
+OPTIONS, e.g. {"journal_mode": "WAL", "busy_timeout": 5000}, and starts
+transactions with ``BEGIN <transaction_mode>`` when that option is set.
+
+BEGIN IMMEDIATE takes the write lock when an atomic block starts, so a
+writer waits for busy_timeout instead of failing with "database is locked"
+when it upgrades a read transaction that another writer got to first.
+"""
+from django.db.backends.sqlite3 import base
+
+OWN_OPTIONS = ("pragmas", "transaction_mode")
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for option in OWN_OPTIONS:
+            params.pop(option, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        pragmas = self.settings_dict["OPTIONS"].get("pragmas", {})
+        for name, value in pragmas.items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        transaction_mode = self.settings_dict["OPTIONS"].get("transaction_mode")
+        if transaction_mode:
+            self.cursor().execute(f"BEGIN {transaction_mode}")
+        else:
+            super()._start_transaction_under_autocommit()
@@ -0,0 +1,40 @@
+import threading
+from collections import Counter
+
+
+class Counters:
+    """Named, thread-safe, in-process counters reported by the stats endpoint"""
+
+    registry = {}
+
+    def __init__(self, name, *keys, ratios=None):
+        """
+        ratios maps names of reported ratios to (hits, misses) key pairs,
+        as hits / (hits + misses)
+        """
+        self.name = name
+        self.ratios = ratios or {}
+        self._lock = threading.Lock()
+        self._counter = Counter(dict.fromkeys(keys, 0))
+        Counters.registry[name] = self
+
+    def incr(self, key, value=1):
+        with self._lock:
+            self._counter[key] += value
+
+    def snapshot(self):
+        with self._lock:
+            snapshot = dict(self._counter)
+        for name, (hits, misses) in self.ratios.items():
+            total = snapshot[hits] + snapshot[misses]
+            snapshot[name] = round(snapshot[hits] / total, 4) if total else None
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            for key in self._counter:
+                self._counter[key] = 0
+
+    @classmethod
+    def snapshot_all(cls):
+        return {name: counters.snapshot() for name, counters in cls.registry.items()}
@@ -21,11 +21,16 @@ from drf_spectacular.views import (
     SpectacularRedocView,
 )
 
+from library_service.views import MetricsView, StatsView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/user/", include("users.urls", namespace="user")),
     path("api/catalogue/", include("books.urls", namespace="library")),
     path("api/service/", include("borrowings.urls", namespace="borrowings")),
+    path("api/analytics/", include("analytics.urls", namespace="analytics")),
+    path("api/stats/", StatsView.as_view(), name="stats"),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/schema/swagger-ui/",
@@ -0,0 +1,29 @@
+from django.http import HttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from library_service import metrics
+from library_service.stats import Counters
+
+
+class StatsView(APIView):
+    """In-process counters of the caches, per worker process"""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request):
+        return Response(Counters.snapshot_all())
+
+
+class MetricsView(APIView):
+    """Request metrics per view in the Prometheus text format, per worker process"""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(responses={(200, "text/plain"): OpenApiTypes.STR})
+    def get(self, request):
+        return HttpResponse(metrics.render_metrics(), content_type=metrics.CONTENT_TYPE)
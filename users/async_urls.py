@@ -0,0 +1,17 @@
+from django.urls import path
+from rest_framework_simplejwt.views import TokenRefreshView
+
+from users.async_views import (
+    AsyncCreateUserView,
+    AsyncManageUserView,
+    AsyncTokenObtainPairView,
+)
+
+urlpatterns = [
+    path("register/", AsyncCreateUserView.as_view(), name="create"),
+    path("me/", AsyncManageUserView.as_view(), name="manage"),
+    path("token/", AsyncTokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+]
+
+app_name = "user"
@@ -0,0 +1,102 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.http import JsonResponse
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import NotAuthenticated, ValidationError
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from library_service.async_views import AsyncAPIView
+from users import hashing
+from users.serializers import CredentialsSerializer, UserSerializer
+
+NO_ACTIVE_ACCOUNT = _("No active account found with the given credentials")
+
+
+async def validate(serializer):
+    """Run serializer validation, which may query the database, in a thread"""
+    if not await sync_to_async(serializer.is_valid)():
+        raise ValidationError(serializer.errors)
+    return serializer.validated_data
+
+
+class AsyncCreateUserView(AsyncAPIView):
+    authentication_classes = []
+
+    async def post(self, request):
+        data = await validate(UserSerializer(data=self.get_data(request)))
+        user_model = get_user_model()
+        user = user_model(
+            email=user_model.objects.normalize_email(data["email"]),
+            password=await hashing.make_password(data["password"]),
+        )
+        await user.asave()
+        return JsonResponse(UserSerializer(user).data, status=status.HTTP_201_CREATED)
+
+
+class AsyncManageUserView(AsyncAPIView):
+    async def get_user(self, request):
+        user = await self.authenticate(request)
+        if user is None:
+            raise NotAuthenticated()
+        return await get_user_model().objects.aget(pk=user.pk)
+
+    async def get(self, request):
+        user = await self.get_user(request)
+        return JsonResponse(UserSerializer(user).data)
+
+    async def put(self, request, partial=False):
+        user = await self.get_user(request)
+        serializer = UserSerializer(user, data=self.get_data(request), partial=partial)
+        data = await validate(serializer)
+
+        password = data.pop("password", None)
+        for field, value in data.items():
+            setattr(user, field, value)
+        if password:
+            user.password = await hashing.make_password(password)
+        await user.asave()
+        return JsonResponse(UserSerializer(user).data)
+
+    async def patch(self, request):
+        return await self.put(request, partial=True)
+
+
+class AsyncTokenObtainPairView(AsyncAPIView):
+    """
+    TokenObtainPairView which verifies the password in the hashing pool
+    instead of the request thread
+    """
+
+    authentication_classes = []
+
+    def get_authenticate_header(self, request):
+        return JWTAuthentication().authenticate_header(request)
+
+    async def post(self, request):
+        credentials = await validate(CredentialsSerializer(data=self.get_data(request)))
+        user_model = get_user_model()
+        user = await user_model.objects.filter(
+            **{user_model.USERNAME_FIELD: credentials["email"]}
+        ).afirst()
+
+        if user is None:
+            # Hash anyway, so response times don't tell which emails exist
+            await hashing.make_password(credentials["password"])
+        if (
+            user is None
+            or not await hashing.check_password(credentials["password"], user.password)
+            or not user.is_active
+        ):
+            raise AuthenticationFailed(NO_ACTIVE_ACCOUNT, "no_active_account")
+
+        if api_settings.UPDATE_LAST_LOGIN:
+            await sync_to_async(update_last_login)(None, user)
+        refresh = RefreshToken.for_user(user)
+        return JsonResponse(
+            {"refresh": str(refresh), "access": str(refresh.access_token)}
+        )
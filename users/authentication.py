@@ -0,0 +1,123 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from library_service.lru import LRUCache
+from library_service.stats import Counters
+
+USER_FIELDS = ["id", "is_staff", "is_active"]
+
+stats = Counters(
+    "auth_cache",
+    "token_hits",
+    "token_misses",
+    "user_hits",
+    "user_misses",
+    ratios={
+        "token_hit_ratio": ("token_hits", "token_misses"),
+        "user_hit_ratio": ("user_hits", "user_misses"),
+    },
+)
+
+token_cache = LRUCache(settings.AUTH_CACHE_SIZE)
+user_cache = LRUCache(settings.AUTH_CACHE_SIZE)
+
+
+def forget_user(user_id):
+    """
+    Drop the cached state of a changed user, again once the transaction
+    commits so a concurrent request can't cache a value from before it.
+    """
+    user_cache.delete_many([user_id])
+    transaction.on_commit(lambda: user_cache.delete_many([user_id]))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication which caches verified tokens until they expire, at most
+    for AUTH_CACHE_TIMEOUT, and the id, is_staff and is_active of their users.
+
+    Users are built from the cached fields with the other fields deferred,
+    so they are only loaded by the views which read them.
+    """
+
+    def get_validated_token(self, raw_token):
+        key = hashlib.sha256(raw_token).digest()
+        validated_token = token_cache.get(key)
+        if validated_token is not None:
+            stats.incr("token_hits")
+            return validated_token
+
+        stats.incr("token_misses")
+        validated_token = super().get_validated_token(raw_token)
+        timeout = min(
+            settings.AUTH_CACHE_TIMEOUT,
+            validated_token.get("exp", 0) - time.time(),
+        )
+        if timeout > 0:
+            token_cache.set(key, validated_token, timeout)
+        return validated_token
+
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        values = self.get_cached_user(user_id)
+        if values is None:
+            values = self.cache_user(user_id, self.get_user_values(user_id).first())
+        return self.build_user(values)
+
+    async def aauthenticate(self, request):
+        """authenticate() which loads uncached users with the async ORM"""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        user_id = self.get_user_id(validated_token)
+        values = self.get_cached_user(user_id)
+        if values is None:
+            values = self.cache_user(
+                user_id, await self.get_user_values(user_id).afirst()
+            )
+        return self.build_user(values), validated_token
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def get_user_values(self, user_id):
+        return self.user_model.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).values_list(*USER_FIELDS)
+
+    @staticmethod
+    def get_cached_user(user_id):
+        values = user_cache.get(user_id)
+        stats.incr("user_misses" if values is None else "user_hits")
+        return values
+
+    @staticmethod
+    def cache_user(user_id, values):
+        if values is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        user_cache.set(user_id, values, settings.AUTH_CACHE_TIMEOUT)
+        return values
+
+    def build_user(self, values):
+        user = self.user_model.from_db(
+            router.db_for_read(self.user_model), USER_FIELDS, values
+        )
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -0,0 +1,28 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+# PBKDF2 releases the GIL, so a few threads hash in parallel while the event
+# loop keeps serving other requests. The pool bounds how many CPUs logins use.
+executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASHING_WORKERS,
+    thread_name_prefix="password-hashing",
+)
+
+
+async def run_in_executor(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, partial(func, *args)
+    )
+
+
+async def make_password(password):
+    return await run_in_executor(hashers.make_password, password)
+
+
+async def check_password(password, encoded):
+    """Verify a password without the rehashing setter of User.check_password"""
+    return await run_in_executor(hashers.check_password, password, encoded)
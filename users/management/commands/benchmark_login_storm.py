@@ -0,0 +1,92 @@
+import asyncio
+import statistics
+import time
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+
+from library_service.benchmark import format_ms, rolled_back, seed_catalogue
+
+SCENARIOS = [
+    ("no logins", "library_service.urls", False),
+    ("sync token view", "library_service.urls", True),
+    ("async token view", "library_service.async_urls", True),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure catalogue latency during a burst of logins through the sync "
+        "and the async token views, served in-process like under ASGI"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=1000)
+        parser.add_argument("--logins", type=int, default=20)
+        parser.add_argument("--concurrency", type=int, default=10)
+        parser.add_argument("--requests", type=int, default=50)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            seed_catalogue(options["books"])
+            get_user_model().objects.create_user(
+                email="storm@library.com", password="qwer1234"
+            )
+            self.stdout.write(f"Seeded {options['books']} books\n")
+
+            for label, urlconf, logins in SCENARIOS:
+                with override_settings(
+                    ROOT_URLCONF=urlconf, ALLOWED_HOSTS=["testserver"]
+                ):
+                    latencies, elapsed = async_to_sync(self.storm)(
+                        options["logins"] if logins else 0,
+                        options["concurrency"],
+                        options["requests"],
+                    )
+                latencies.sort()
+                self.stdout.write(
+                    f"{label:<17}"
+                    f"  catalogue p50 {format_ms(statistics.median(latencies)):>10}"
+                    f"  p95 {format_ms(latencies[int(len(latencies) * 0.95)]):>10}"
+                    f"  max {format_ms(latencies[-1]):>10}"
+                    f"  total {elapsed:.2f} s"
+                )
+
+    async def storm(self, logins, concurrency, requests):
+        """
+        Run logins, at most concurrency at a time, alongside sequential
+        catalogue reads. Returns the read latencies and the total duration.
+        """
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+        books_url = reverse("library:book-list")
+        token_url = reverse("user:token_obtain_pair")
+
+        async def login():
+            async with semaphore:
+                response = await client.post(
+                    token_url,
+                    {"email": "storm@library.com", "password": "qwer1234"},
+                    content_type="application/json",
+                )
+            if response.status_code != 200:
+                raise CommandError(f"Login failed with {response.status_code}")
+
+        async def browse():
+            latencies = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                await client.get(books_url)
+                latencies.append(time.perf_counter() - started)
+                # Think time, which lets the logins queue up in between
+                await asyncio.sleep(0.005)
+            return latencies
+
+        started = time.perf_counter()
+        latencies, *_ = await asyncio.gather(
+            browse(), *(login() for _ in range(logins))
+        )
+        return latencies, time.perf_counter() - started
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.4 on 2026-10-18 17:06
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_active_borrowings(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    Borrowing = apps.get_model("borrowings", "Borrowing")
+    active = (
+        Borrowing.objects.filter(user=OuterRef("pk"), actual_return_date__isnull=True)
+        .order_by()
+        .values("user")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    User.objects.update(active_borrowings=Coalesce(Subquery(active), Value(0)))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+        ("borrowings", "0010_alter_borrowing_user_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="active_borrowings",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_active_borrowings, migrations.RunPython.noop),
+    ]
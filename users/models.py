@@ -7,6 +7,9 @@ from users.managers import UserManager
 class User(AbstractUser):
     username = None
     email = models.EmailField("email address", unique=True)
+    # Borrowings not returned yet, kept up to date by borrowings.operations so
+    # that BORROWING_LIMIT can be checked without counting borrowings
+    active_borrowings = models.PositiveIntegerField(default=0, editable=False)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -22,3 +22,10 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class CredentialsSerializer(serializers.Serializer):
+    """Credentials posted to the async token view"""
+
+    email = serializers.CharField()
+    password = serializers.CharField(trim_whitespace=False)
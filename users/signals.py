@@ -0,0 +1,43 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from borrowings.models import Borrowing
+from users import authentication
+from users.models import User
+
+
+def add_active_borrowings(user_id, count):
+    User.objects.filter(id=user_id).update(
+        active_borrowings=Greatest(F("active_borrowings") + count, 0)
+    )
+
+
+@receiver(post_save, sender=Borrowing)
+def count_active_borrowing_when_created(sender, instance, created, **kwargs):
+    """Borrowings created through the ORM rather than borrowings.operations"""
+    if (
+        created
+        and instance.actual_return_date is None
+        and not getattr(instance, "_inventory_reserved", False)
+    ):
+        add_active_borrowings(instance.user_id, 1)
+
+
+@receiver(post_save, sender=Borrowing)
+def uncount_active_borrowing_when_returned(sender, instance, created, **kwargs):
+    if not created and getattr(instance, "_returned", False):
+        add_active_borrowings(instance.user_id, -1)
+
+
+@receiver(post_delete, sender=Borrowing)
+def uncount_active_borrowing_when_deleted(sender, instance, **kwargs):
+    if instance.actual_return_date is None:
+        add_active_borrowings(instance.user_id, -1)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def update_auth_cache_when_user_changed(sender, instance, **kwargs):
+    authentication.forget_user(instance.pk)
@@ -1,3 +1,180 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import urlencode
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from users import authentication
+
+ME_URL = reverse("user:manage")
+REGISTER_URL = reverse("user:create")
+TOKEN_URL = reverse("user:token_obtain_pair")
+STATS_URL = reverse("stats")
+
+
+def user_queries(context):
+    return [
+        query["sql"]
+        for query in context.captured_queries
+        if '"users_user"' in query["sql"]
+    ]
+
+
+class CachedJWTAuthenticationTest(TestCase):
+    def setUp(self) -> None:
+        authentication.token_cache.clear()
+        authentication.user_cache.clear()
+        authentication.stats.reset()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="qwer1234"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_user_is_read_once(self):
+        self.client.get(STATS_URL)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(STATS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(user_queries(context), [])
+        self.assertEqual(
+            authentication.stats.snapshot(),
+            {
+                "token_hits": 1,
+                "token_misses": 1,
+                "user_hits": 1,
+                "user_misses": 1,
+                "token_hit_ratio": 0.5,
+                "user_hit_ratio": 0.5,
+            },
+        )
+
+    def test_saving_user_invalidates_cache(self):
+        self.client.get(STATS_URL)
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.client.get(STATS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["auth_cache"]["user_misses"], 2)
+
+    def test_inactive_user_rejected(self):
+        self.client.get(STATS_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(STATS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_other_user_fields_are_loaded_on_access(self):
+        self.client.get(ME_URL)
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], self.user.email)
+
+    def test_invalid_token_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(authentication.stats.snapshot()["token_hits"], 0)
+
+
+@override_settings(ROOT_URLCONF="library_service.async_urls")
+class AsyncUserViewsTest(TestCase):
+    async def obtain_token(self, email, password):
+        return await self.async_client.post(
+            TOKEN_URL,
+            {"email": email, "password": password},
+            content_type="application/json",
+        )
+
+    async def test_register_login_and_change_password(self):
+        response = await self.async_client.post(
+            REGISTER_URL, {"email": "user@user.com", "password": "qwer1234"}
+        )
+        token_response = await self.obtain_token("user@user.com", "qwer1234")
+        headers = {"AUTHORIZATION": f"Bearer {token_response.json()['access']}"}
+        me_response = await self.async_client.patch(
+            ME_URL,
+            {"password": "asdf5678"},
+            content_type="application/json",
+            headers=headers,
+        )
+        new_token_response = await self.obtain_token("user@user.com", "asdf5678")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["email"], "user@user.com")
+        self.assertNotIn("password", response.json())
+        self.assertEqual(token_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(me_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(me_response.json()["email"], "user@user.com")
+        self.assertEqual(new_token_response.status_code, status.HTTP_200_OK)
+
+    async def test_update_me_with_form_bodies(self):
+        user = await get_user_model().objects.acreate(email="user@user.com")
+        headers = {"AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+        form_response = await self.async_client.patch(
+            ME_URL,
+            urlencode({"email": "form@user.com"}),
+            content_type="application/x-www-form-urlencoded",
+            headers=headers,
+        )
+        multipart_response = await self.async_client.patch(
+            ME_URL,
+            encode_multipart(BOUNDARY, {"password": "asdf5678"}),
+            content_type=MULTIPART_CONTENT,
+            headers=headers,
+        )
+        text_response = await self.async_client.patch(
+            ME_URL, "email", content_type="text/plain", headers=headers
+        )
+        await user.arefresh_from_db()
+
+        self.assertEqual(form_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(multipart_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user.email, "form@user.com")
+        self.assertTrue(user.check_password("asdf5678"))
+        self.assertEqual(
+            text_response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+        )
+
+    async def test_register_validates_like_sync_view(self):
+        await get_user_model().objects.acreate(email="user@user.com")
+
+        response = await self.async_client.post(
+            REGISTER_URL, {"email": "user@user.com", "password": "qwe"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.json()), {"email", "password"})
+
+    async def test_wrong_password(self):
+        await get_user_model().objects.acreate(email="user@user.com")
+
+        response = await self.obtain_token("user@user.com", "qwer1234")
+        unknown_response = await self.obtain_token("unknown@user.com", "qwer1234")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(unknown_response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_me_requires_authentication(self):
+        response = await self.async_client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", response)